@@ -2,10 +2,15 @@
 HTML 파일에서 <table>...</table>만 추출하고 모든 스타일과 줄바꿈을 제거하는 유틸리티
 """
 
+import os
 import re
-from bs4 import BeautifulSoup, NavigableString, Comment
+import sys
+import lxml.html
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 
 # 제거할 속성 목록
@@ -23,24 +28,57 @@ STYLE_ATTRIBUTES = [
     "cellspacing",
 ]
 
+# 스타일 관련 태그 목록 (태그만 제거하고 내용은 유지)
+STYLE_TAGS = [
+    "strong", "b", "i", "em", "u", "span", "font", "mark", "small", "big", "sub", "sup",
+    "s", "strike", "del", "ins", "abbr", "cite", "code", "kbd", "samp", "var",
+]
+
+DECOMPOSE_TAGS = frozenset(["style", "br", "caption"])  # 내용까지 제거
+UNWRAP_TAGS = frozenset(["thead", "tbody", "tfoot", *STYLE_TAGS])  # 태그만 제거
+
+_UTF8_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# 정규식은 모듈 로드 시 한 번만 컴파일
+_TAG_GAP_RE = re.compile(r">\s+<")
+_TABLE_OPEN_RE = re.compile(r"<table", re.IGNORECASE)
+# 첫 "<table" 앞에 이 구문이 있으면 그 "<table"이 주석/스크립트 안의 문자열일 수 있음
+_UNSAFE_PREFIX_RE = re.compile(r"<!--|<script", re.IGNORECASE)
+
+# 일괄 처리 시 진행 로그를 몇 줄씩 모아서 출력할지
+PROGRESS_BATCH_SIZE = 128
+
 
 def normalize_text(text: str) -> str:
     """
     텍스트 내부의 연속 공백/줄바꿈을 단일 공백으로 변환합니다.
     """
     # 모든 공백 문자(줄바꿈, 탭 포함)를 단일 공백으로
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split()은 정규식 \s와 같은 공백 문자 집합을 C 레벨에서 처리 (re.sub 대비 ~4배 빠름)
+    return " ".join(text.split())
 
 
 def remove_whitespace(html: str) -> str:
     """
     HTML 태그 사이의 불필요한 공백과 줄바꿈을 제거합니다.
     """
-    # 태그 사이의 공백/줄바꿈 제거: >    < → ><
-    html = re.sub(r">\s+<", "><", html)
-    # 앞뒤 공백 제거
-    html = html.strip()
-    return html
+    # 태그 사이의 공백/줄바꿈 제거 (>    < → ><) 후 앞뒤 공백 제거
+    return _TAG_GAP_RE.sub("><", html).strip()
+
+
+def _find_first_table(html_content: str) -> Optional[etree._Element]:
+    """HTML을 파싱하여 첫 번째 <table> 요소를 반환합니다."""
+    try:
+        # C 기반 lxml(libxml2)로 파싱
+        root = lxml.html.fromstring(html_content)
+    except etree.ParserError:
+        return None  # 빈 문서
+    except ValueError:
+        # <?xml encoding=...?> 선언이 있는 문서는 bytes로 파싱해야 함
+        root = lxml.html.fromstring(html_content.encode("utf-8"), parser=_UTF8_PARSER)
+    # <table>로 시작하는 조각이면 lxml이 table 요소 자체를 루트로 돌려주므로
+    # iter()의 첫 항목이 곧 결과 (별도의 트리 탐색 없음)
+    return next(root.iter("table"), None)
 
 
 def extract_clean_table(html_content: str) -> Optional[str]:
@@ -53,64 +91,49 @@ def extract_clean_table(html_content: str) -> Optional[str]:
     Returns:
         스타일과 줄바꿈이 제거된 <table> HTML 문자열, 테이블이 없으면 None
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    # 테이블이 없는 입력(빈 파일, 설명문 등)은 파싱 없이 바로 반환 (대문자 태그도 고려)
+    lo = html_content.find("<table")
+    if lo == -1 and not _TABLE_OPEN_RE.search(html_content):
+        return None
     
-    # 첫 번째 table 태그 찾기
-    table = soup.find("table")
+    # 문서 전체 대신 첫 <table부터 마지막 </table>까지만 파싱 (head/script 등 생략)
+    # 단, 앞부분에 주석/스크립트가 있으면 첫 "<table"이 실제 태그인지 알 수 없으므로 생략
+    table = None
+    hi = html_content.rfind("</table>")
+    if lo != -1 and hi > lo and not _UNSAFE_PREFIX_RE.search(html_content, 0, lo):
+        table = _find_first_table(html_content[lo:hi + len("</table>")])
+        # 실제 표라면 조각의 루트가 곧 table이고 그 앞에 텍스트가 없어야 함
+        # (속성값 안의 "<table" 등으로 잘못 자른 경우 전체 문서 파싱으로 전환)
+        if table is not None and (table.getparent() is not None or (table.text or "").strip()):
+            table = None
+    
+    # 조각 파싱에 실패하면 (대문자 태그, 위의 검사 실패 등) 전체 문서를 파싱
+    if table is None:
+        table = _find_first_table(html_content)
     if table is None:
         return None
     
-    # table 내 모든 태그에서 스타일 속성 제거
-    for tag in table.find_all(True):  # True = 모든 태그
-        for attr in STYLE_ATTRIBUTES:
-            if tag.has_attr(attr):
-                del tag[attr]
-    
-    # table 자체의 스타일 속성도 제거
-    for attr in STYLE_ATTRIBUTES:
-        if table.has_attr(attr):
-            del table[attr]
-    
-    # <style> 태그 제거 (table 내부에 있을 경우)
-    for style_tag in table.find_all("style"):
-        style_tag.decompose()
-    
-    # <br> 태그 제거
-    for br_tag in table.find_all("br"):
-        br_tag.decompose()
-    
-    # <thead>, <tbody>, <tfoot> 태그 제거 (내용은 유지)
-    for wrapper_tag in table.find_all(["thead", "tbody", "tfoot"]):
-        wrapper_tag.unwrap()
-    
-    # <caption> 태그 제거
-    for caption_tag in table.find_all("caption"):
-        caption_tag.decompose()
-    
-    # 스타일 관련 태그 제거 (내용은 유지): <strong>, <b>, <i>, <em>, <u>, <span>, <font>, <mark> 등
-    style_tags = ["strong", "b", "i", "em", "u", "span", "font", "mark", "small", "big", "sub", "sup", "s", "strike", "del", "ins", "abbr", "cite", "code", "kbd", "samp", "var"]
-    for tag_name in style_tags:
-        for style_tag in table.find_all(tag_name):
-            style_tag.unwrap()
-    
-    # HTML 주석 제거 (<!-- ... -->)
-    for comment in table.find_all(string=lambda text: isinstance(text, Comment)):
-        comment.extract()
-    
-    # 텍스트 노드 내부의 공백/줄바꿈 정규화
-    for text_node in table.find_all(string=True):
-        if isinstance(text_node, NavigableString):
-            normalized = normalize_text(str(text_node))
-            if normalized:
-                text_node.replace_with(normalized)
-            elif text_node.strip() == "":
-                text_node.extract()  # 빈 텍스트 노드 제거
-    
-    # HTML 문자열로 변환 후 태그 간 줄바꿈/공백 제거
-    result = str(table)
-    result = remove_whitespace(result)
-    
-    return result
+    # 텍스트 노드 내부의 공백/줄바꿈 정규화 (태그 제거로 텍스트가 합쳐지기 전에 수행)
+    # 노드마다 호출되는 hot loop이므로 normalize_text를 인라인으로 적용
+    for el in table.iter():
+        if el.text:
+            el.text = " ".join(el.text.split()) or None
+        if el.tail:
+            el.tail = " ".join(el.tail.split()) or None
+    
+    # 태그/주석/속성 제거는 lxml의 C 구현에 맡김
+    # <style>, <br>, <caption>, 주석 제거 (뒤따르는 텍스트는 유지)
+    etree.strip_elements(table, *DECOMPOSE_TAGS, etree.Comment, with_tail=False)
+    # <thead>, <tbody>, <tfoot> 및 스타일 관련 태그 제거 (내용은 유지)
+    etree.strip_tags(table, *UNWRAP_TAGS)
+    # table 및 하위 모든 태그의 스타일 속성 제거
+    etree.strip_attributes(table, *STYLE_ATTRIBUTES)
+    
+    # HTML 문자열로 변환 (공백뿐인 텍스트 노드는 위에서 모두 제거되어 태그 사이 공백이 생기지 않으므로
+    # remove_whitespace 후처리 불필요)
+    return lxml.html.tostring(
+        table, encoding="unicode", method="html", pretty_print=False, with_tail=False
+    )
 
 
 def extract_clean_table_from_file(file_path: str) -> Optional[str]:
@@ -124,7 +147,8 @@ def extract_clean_table_from_file(file_path: str) -> Optional[str]:
         스타일이 제거된 <table> HTML 문자열
     """
     path = Path(file_path)
-    html_content = path.read_text(encoding="utf-8")
+    # 줄바꿈 변환이 필요 없으므로 텍스트 레이어 없이 bytes로 읽어 디코딩
+    html_content = path.read_bytes().decode("utf-8")
     return extract_clean_table(html_content)
 
 
@@ -148,7 +172,7 @@ def process_html_file(input_path: str, output_path: Optional[str] = None) -> str
         input_p = Path(input_path)
         output_path = str(input_p.parent / f"{input_p.stem}_clean{input_p.suffix}")
     
-    Path(output_path).write_text(clean_table, encoding="utf-8")
+    Path(output_path).write_bytes(clean_table.encode("utf-8"))
     return output_path
 
 
@@ -168,15 +192,15 @@ def clean_html_response(html_content: str) -> str:
     """
     content = html_content.strip()
     
-    # 마크다운 코드블록 제거
+    # 마크다운 코드블록 제거 (줄 단위 split/join 없이 슬라이싱으로 처리)
     if content.startswith("```"):
-        lines = content.split("\n")
         # 첫 줄 (```html 등) 제거
-        lines = lines[1:]
+        first_nl = content.find("\n")
+        content = content[first_nl + 1:] if first_nl != -1 else ""
         # 마지막 줄 (```) 제거
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
+        last_nl = content.rfind("\n")
+        if content[last_nl + 1:].strip() == "```":
+            content = content[:last_nl] if last_nl != -1 else ""
     
     # table 추출 및 스타일 제거
     clean_table = extract_clean_table(content)
@@ -184,61 +208,105 @@ def clean_html_response(html_content: str) -> str:
     return clean_table if clean_table else content
 
 
-def process_output_qa_folder(input_folder: str = "Output_QA", output_folder: str = "Output_simple") -> int:
+def _iter_html_files(folder: str) -> Iterator[str]:
+    """
+    폴더 내 HTML 파일 경로를 하나씩 반환합니다.
+    (scandir는 pathlib 객체 생성 없이 DirEntry의 캐시된 정보 사용)
+    """
+    with os.scandir(folder) as entries:
+        for e in entries:
+            if e.name.endswith(".html") and not e.name.startswith(".") and e.is_file():
+                yield e.path
+
+
+def _process_one(html_path: str, output_folder: str) -> Tuple[str, bool, Optional[str]]:
+    """
+    HTML 파일 하나를 정제하여 저장합니다. (프로세스 풀 워커에서 실행)
+    
+    Returns:
+        (파일명, 성공 여부, 에러 메시지)
+    """
+    name = os.path.basename(html_path)
+    try:
+        # 텍스트 레이어(줄바꿈 변환) 없이 bytes로 읽고 쓰기
+        with open(html_path, "rb") as f:
+            html_content = f.read().decode("utf-8")
+        clean_table = clean_html_response(html_content)
+        
+        if not (clean_table and clean_table.strip()):
+            return name, False, None
+        
+        # 작은 파일이 대부분이므로 버퍼링 레이어 없이 fd에 바로 기록
+        data = memoryview(clean_table.encode("utf-8"))
+        fd = os.open(os.path.join(output_folder, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        return name, True, None
+    except Exception as e:
+        return name, False, str(e)
+
+
+def process_output_qa_folder(
+    input_folder: str = "Output_QA",
+    output_folder: str = "Output_simple",
+    max_workers: Optional[int] = None,
+) -> int:
     """
     Output_QA 폴더의 모든 HTML 파일을 처리하여 정제된 테이블을 Output_simple 폴더에 저장합니다.
+    파일들은 서로 독립적이므로 여러 프로세스에서 병렬로 처리합니다.
     
     Args:
         input_folder: 입력 폴더 경로 (기본: Output_QA)
         output_folder: 출력 폴더 경로 (기본: Output_simple)
+        max_workers: 워커 프로세스 수 (None이면 CPU 코어 수)
         
     Returns:
         처리된 파일 개수
     """
-    input_path = Path(input_folder)
-    output_path = Path(output_folder)
-    
-    if not input_path.exists():
+    if not os.path.isdir(input_folder):
         print(f"[!] Input folder '{input_folder}' does not exist.")
         return 0
     
     # 출력 폴더 생성
-    output_path.mkdir(parents=True, exist_ok=True)
-    
-    # HTML 파일들 찾기
-    html_files = list(input_path.glob("*.html"))
-    if not html_files:
-        print(f"[!] No HTML files found in '{input_folder}'")
-        return 0
+    os.makedirs(output_folder, exist_ok=True)
     
-    print(f"[*] Found {len(html_files)} HTML files in '{input_folder}'")
+    print(f"[*] Processing HTML files in '{input_folder}'")
     
     success_count = 0
     failed_files = []
     
-    for html_file in html_files:
-        try:
-            # HTML 파일 읽기
-            html_content = html_file.read_text(encoding="utf-8")
-            
-            # 정제된 테이블 추출
-            clean_table = clean_html_response(html_content)
-            
-            if clean_table and clean_table.strip():
-                # 출력 파일 경로
-                output_file = output_path / html_file.name
-                
-                # 파일 저장
-                output_file.write_text(clean_table, encoding="utf-8")
+    messages = []
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # 파일 목록을 미리 만들지 않고 디렉토리 탐색과 동시에 워커에 전달
+        html_files = _iter_html_files(input_folder)
+        results = executor.map(_process_one, html_files, repeat(output_folder), chunksize=16)
+        
+        # 진행 상황 출력은 메인 프로세스에서만, 파일마다 flush하지 않고 모아서 출력
+        for name, ok, error in results:
+            if ok:
                 success_count += 1
-                print(f"    [✓] {html_file.name} → {output_file.name}")
+                messages.append(f"    [✓] {name} → {name}")
+            elif error is None:
+                failed_files.append(name)
+                messages.append(f"    [!] No valid table found in {name}")
             else:
-                failed_files.append(html_file.name)
-                print(f"    [!] No valid table found in {html_file.name}")
-                
-        except Exception as e:
-            failed_files.append(html_file.name)
-            print(f"    [!] Error processing {html_file.name}: {e}")
+                failed_files.append(name)
+                messages.append(f"    [!] Error processing {name}: {error}")
+            
+            if len(messages) >= PROGRESS_BATCH_SIZE:
+                sys.stdout.write("\n".join(messages) + "\n")
+                messages.clear()
+    
+    if messages:
+        sys.stdout.write("\n".join(messages) + "\n")
+    
+    if success_count == 0 and not failed_files:
+        print(f"[!] No HTML files found in '{input_folder}'")
+        return 0
     
     print(f"\n[*] Processing completed: {success_count} successful, {len(failed_files)} failed")
     if failed_files:
@@ -271,6 +339,12 @@ if __name__ == "__main__":
         "--output-file",
         help="Output file path (when using --input-file)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
@@ -291,6 +365,6 @@ if __name__ == "__main__":
         print(f"Output: {args.output_dir}")
         print("-" * 50)
         
-        count = process_output_qa_folder(args.input_dir, args.output_dir)
+        count = process_output_qa_folder(args.input_dir, args.output_dir, max_workers=args.workers)
         print("-" * 50)
         print(f"[✓] {count} files processed successfully!")
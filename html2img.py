@@ -1,15 +1,26 @@
 import asyncio
-import base64
 import random
 import glob
 import os
 import re
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 
 from playwright.async_api import async_playwright
 
+from html_utils import clean_markdown_codeblocks, extract_font_family_from_html
+
+try:
+    # 설치되어 있으면 SIMD 가속 base64 사용 (폰트 파일 인코딩용, 선택 사항)
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 
 # -----------------------------
 # 기본 한글 폰트 설정
@@ -25,65 +36,24 @@ DEFAULT_KOREAN_FONTS = (
 )
 
 
-def extract_font_family_from_html(html_content: str) -> Optional[str]:
-    """
-    HTML 내용에서 font-family CSS 속성을 추출합니다.
-    
-    Args:
-        html_content: HTML 문자열
-        
-    Returns:
-        추출된 font-family 값 또는 None
-    """
-    # CSS style 태그 내에서 font-family 찾기
-    patterns = [
-        r"font-family\s*:\s*([^;}{]+)[;}]",  # CSS 블록 내
-        r"font-family\s*=\s*['\"]([^'\"]+)['\"]",  # inline style
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
-        if matches:
-            # 첫 번째 매치 반환 (보통 body나 table에 적용된 폰트)
-            font_family = matches[0].strip()
-            # 따옴표 정리
-            font_family = font_family.replace('"', "'").strip()
-            if font_family:
-                return font_family
-    
-    return None
+_CAPTION_RE = re.compile(r'<caption[^>]*>.*?</caption>\s*', re.DOTALL | re.IGNORECASE)
+
+# 완전한 HTML 문서 여부 및 폰트 스타일 삽입 위치 탐색용 (소문자 사본 없이 원문에서 바로 검색)
+_DOC_START_RE = re.compile(r"\s*<(?:!doctype|html)", re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(r"</head>", re.IGNORECASE)
+_BODY_OPEN_RE = re.compile(r"<body", re.IGNORECASE)
 
 
 # -----------------------------
-# Helper: Clean markdown codeblocks
+# Helper: Remove caption tags
+# (마크다운 코드블록 제거는 html_utils.clean_markdown_codeblocks 사용)
 # -----------------------------
-def clean_markdown_codeblocks(content: str) -> str:
-    """
-    HTML 내용에서 마크다운 코드블록(```html ... ```)을 제거합니다.
-    """
-    content = content.strip()
-    
-    # 마크다운 코드블록 제거
-    if content.startswith("```"):
-        lines = content.split("\n")
-        # 첫 줄 (```html 등) 제거
-        lines = lines[1:]
-        # 마지막 줄 (```) 제거
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
-    
-    return content.strip()
-
-
 def remove_caption_tags(content: str) -> str:
     """
     HTML 내용에서 <caption>...</caption> 태그를 제거합니다.
     """
-    import re
     # <caption>...</caption> 태그 전체 제거 (줄바꿈 포함)
-    content = re.sub(r'<caption[^>]*>.*?</caption>\s*', '', content, flags=re.DOTALL | re.IGNORECASE)
-    return content
+    return _CAPTION_RE.sub('', content)
 
 
 # -----------------------------
@@ -105,7 +75,13 @@ def font_face_base64(font_path: str, family: str = "MyKR") -> str:
     fp = Path(font_path).resolve()
     if not fp.exists():
         raise FileNotFoundError(f"Font file not found: {fp}")
+    return _font_face_css(str(fp), family)
+
 
+@lru_cache(maxsize=32)
+def _font_face_css(resolved_path: str, family: str) -> str:
+    """폰트 파일 경로별로 base64 @font-face CSS를 한 번만 생성합니다."""
+    fp = Path(resolved_path)
     data = fp.read_bytes()
     b64 = base64.b64encode(data).decode("ascii")
 
@@ -134,6 +110,7 @@ def font_face_base64(font_path: str, family: str = "MyKR") -> str:
 # -----------------------------
 # Size-fixed base CSS
 # -----------------------------
+@lru_cache(maxsize=64)  # 추출 폰트별로 재사용 (대부분은 font_family=None)
 def build_size_fixed_base_css(
     *,
     font_family: Optional[str] = None,
@@ -222,13 +199,36 @@ THEMES: List[Theme] = [
     Theme("mono",        "#333333", "#ffffff", "#111111", "#ffffff", "#ffffff", "none", False, 3.5),
 ]
 
+# 색칠하지 않을 때 사용하는 기본 테마
+_PLAIN_THEME = Theme("plain", "#222222", "#ffffff", "#111111", "#ffffff", "#ffffff", "none", False, 1.0)
+
+
+# THEMES의 누적 가중치 (가중치가 바뀌면 set_theme_weights로 다시 계산)
+_THEME_CUM_WEIGHTS: List[float] = list(accumulate(theme.weight for theme in THEMES))
+
+
+def set_theme_weights(weights: List[float]) -> None:
+    """THEMES의 가중치를 갱신하고 누적 가중치를 다시 계산합니다."""
+    global _THEME_CUM_WEIGHTS
+    for i, weight in enumerate(weights):
+        THEMES[i] = replace(THEMES[i], weight=weight)
+    cum_weights = list(accumulate(theme.weight for theme in THEMES))
+    if not cum_weights[-1] > 0.0:
+        raise ValueError("Total of theme weights must be greater than zero")
+    _THEME_CUM_WEIGHTS = cum_weights
+
 
 def choose_weighted_theme(themes: List[Theme]) -> Theme:
     """가중치에 따라 테마를 선택합니다."""
-    weights = [theme.weight for theme in themes]
-    return random.choices(themes, weights=weights, k=1)[0]
+    # random.choices와 같은 방식(bisect)으로 뽑되, THEMES는 미리 계산한 누적 가중치를 사용
+    if themes is THEMES:
+        cum_weights = _THEME_CUM_WEIGHTS
+    else:
+        cum_weights = list(accumulate(theme.weight for theme in themes))
+    return themes[bisect(cum_weights, random.random() * cum_weights[-1], 0, len(themes) - 1)]
 
 
+@lru_cache(maxsize=None)  # Theme은 frozen이라 해시 가능, 테마별 CSS는 한 번만 생성
 def build_theme_css(theme: Theme) -> str:
     zebra_css = ""
     if theme.zebra:
@@ -285,18 +285,18 @@ def wrap_table_fragment(table_html: str, font_family: Optional[str] = None) -> s
   </style>"""
     
     # 이미 완전한 HTML 문서인 경우 폰트 스타일만 삽입
-    stripped = table_html.strip().lower()
-    if stripped.startswith('<!doctype') or stripped.startswith('<html'):
+    if _DOC_START_RE.match(table_html):
         # </head> 앞에 스타일 삽입
-        if '</head>' in table_html.lower():
-            insert_pos = table_html.lower().find('</head>')
+        m = _HEAD_CLOSE_RE.search(table_html)
+        if m:
+            insert_pos = m.start()
             return table_html[:insert_pos] + font_override_style + table_html[insert_pos:]
-        elif '<body' in table_html.lower():
+        m = _BODY_OPEN_RE.search(table_html)
+        if m:
             # <head>가 없으면 <body> 앞에 삽입
-            insert_pos = table_html.lower().find('<body')
+            insert_pos = m.start()
             return table_html[:insert_pos] + f"<head>{font_override_style}</head>" + table_html[insert_pos:]
-        else:
-            return table_html  # 구조가 이상하면 그대로 반환
+        return table_html  # 구조가 이상하면 그대로 반환
     
     return f"""<!doctype html>
 <html lang="ko">
@@ -312,17 +312,100 @@ def wrap_table_fragment(table_html: str, font_family: Optional[str] = None) -> s
 </html>"""
 
 
+# 셀 크기를 {w: [...], h: [...]} 형태의 평탄한 배열로 반환 (직렬화 크기 축소)
 MEASURE_JS = r"""
 () => {
-  const cells = Array.from(document.querySelectorAll('#shot td, #shot th'));
-  return cells.map(el => {
+  const cells = document.querySelectorAll('#shot td, #shot th');
+  const w = new Array(cells.length), h = new Array(cells.length);
+  cells.forEach((el, i) => {
     const r = el.getBoundingClientRect();
-    return { w: Math.round(r.width * 100) / 100, h: Math.round(r.height * 100) / 100 };
+    w[i] = Math.round(r.width * 100) / 100;
+    h[i] = Math.round(r.height * 100) / 100;
   });
+  return { w, h };
+}
+"""
+
+
+# 테마 적용 후 셀 크기를 브라우저 안에서 기준값(window.__baseMetrics)과 비교
+CHECK_METRICS_JS = r"""
+(tol) => {
+  const base = window.__baseMetrics;
+  const cur = (""" + MEASURE_JS + r""")();
+  if (!base || base.w.length !== cur.w.length) return false;
+  const lo = 1.0 - tol, hi = 1.0 + tol;
+  for (const key of ['w', 'h']) {
+    for (let i = 0; i < base[key].length; i++) {
+      const r = cur[key][i] / Math.max(0.01, base[key][i]);
+      if (!(lo <= r && r <= hi)) return false;
+    }
+  }
+  return true;
+}
+"""
+
+
+# 고정 대기(wait_for_timeout) 대신 사용하는 렌더링 안정화 신호:
+# 강제 레이아웃으로 웹폰트 로딩을 시작시키고, 폰트 로딩 완료 후 두 프레임을 기다림
+SETTLE_JS = r"""
+async () => {
+  void document.body.offsetHeight;
+  if (document.fonts) await document.fonts.ready;
+  await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
 }
 """
 
 
+# set_content 이후 준비 작업을 한 번의 evaluate로 처리:
+# CSS 슬롯 생성 → 래퍼(#shot) 생성 및 패딩 적용 → 렌더링 안정화 → 기준 셀 크기 저장
+PREPARE_PAGE_JS = r"""
+async ({fontCss, baseCss, mt, mr, mb, ml}) => {
+  const table = document.querySelector('table');
+  if (!table) throw new Error('No <table> found');
+
+  // 폰트/기본/테마 CSS를 각각 하나의 <style> 노드에 담음 (이 순서대로 cascade)
+  for (const [id, css] of [['__font_css', fontCss], ['__base_css', baseCss], ['__theme_css', '']]) {
+    const s = document.createElement('style');
+    s.id = id;
+    s.textContent = css;
+    document.head.appendChild(s);
+  }
+
+  let shot = document.getElementById('shot');
+  if (!shot) {
+    shot = document.createElement('div');
+    shot.id = 'shot';
+    document.body.prepend(shot);
+  }
+  shot.style.paddingTop = mt + 'px';
+  shot.style.paddingRight = mr + 'px';
+  shot.style.paddingBottom = mb + 'px';
+  shot.style.paddingLeft = ml + 'px';
+  shot.appendChild(table);
+
+  await (""" + SETTLE_JS + r""")();
+  window.__baseMetrics = (""" + MEASURE_JS + r""")();
+}
+"""
+
+
+# 테마 CSS 적용 + (선택) 허용 오차 검사 + 적용된 폰트 조회를 한 번의 evaluate로 처리
+APPLY_THEME_JS = r"""
+async ({css, tol, check}) => {
+  document.getElementById('__theme_css').textContent = css;
+  let ok = true;
+  if (check) {
+    await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+    ok = (""" + CHECK_METRICS_JS + r""")(tol);
+  }
+  const font = getComputedStyle(document.querySelector('#shot') || document.body).fontFamily;
+  return { ok, font };
+}
+"""
+
+
+# 테마 적용 후 크기 비교는 CHECK_METRICS_JS가 브라우저 안에서 수행하며,
+# 이 함수는 외부 호출자를 위해 원래 시그니처([{"w": ..., "h": ...}, ...]) 그대로 유지
 def within_5pct(base: List[Dict[str, float]], cur: List[Dict[str, float]], tol: float = 0.05) -> bool:
     if len(base) != len(cur):
         return False
@@ -340,26 +423,50 @@ def within_5pct(base: List[Dict[str, float]], cur: List[Dict[str, float]], tol:
 # -----------------------------
 # Main renderer (Updated for Dual Output)
 # -----------------------------
-async def render_table_dual_images(
+PAGE_VIEWPORT = {"width": 2200, "height": 2800}
+
+# 출력 이미지 형식 (Playwright 스크린샷은 png/jpeg만 지원)
+IMAGE_EXTENSIONS = {"png": "png", "jpeg": "jpg"}
+JPEG_QUALITY = 85
+
+
+def _screenshot_options(image_format: Optional[str]) -> Dict[str, object]:
+    """스크린샷 형식 옵션을 반환합니다. None이면 경로 확장자로 판단하도록 비워 둡니다."""
+    if image_format == "jpeg":
+        return {"type": "jpeg", "quality": JPEG_QUALITY}
+    if image_format:
+        return {"type": image_format}
+    return {}
+
+
+async def _new_context(browser, scale: float):
+    """렌더링에 사용할 브라우저 컨텍스트를 생성합니다."""
+    return await browser.new_context(
+        device_scale_factor=scale,
+        viewport=PAGE_VIEWPORT,
+        locale="ko-KR",  # 한국어 로케일 설정
+    )
+
+
+async def _render_on_page(
+    page,
     table_html: str,
-    out_path_std: str,       # 기본 이미지 경로
-    out_path_colored: str,   # 배경색 추가 이미지 경로
+    out_path_std: str,
+    out_path_colored: Optional[str] = None,
     *,
     font_path: Optional[str] = None,
-    seed: Optional[int] = None,
-    scale: float = 2.0,
     mt: int = 0, mr: int = 0, mb: int = 0, ml: int = 0,
     tol: float = 0.05,
-    max_tries: int = 20,
-    color_probability: float = 1.0,  # 색칠 확률 (0.0~1.0)
-) -> Tuple[str, str, List[int]]:
-    
-    if seed is not None:
-        random.seed(seed)
-
-    # 경로 절대경로화
-    out_path_std = str(Path(out_path_std).resolve())
-    out_path_colored = str(Path(out_path_colored).resolve())
+    color_probability: float = 1.0,
+    image_format: Optional[str] = None,
+) -> Tuple[str, str, Optional[List[int]]]:
+    """
+    이미 열려 있는 페이지에서 표를 렌더링하고 스크린샷을 저장합니다.
+    out_path_colored가 None이면 기본 이미지만 저장합니다.
+    출력 경로는 호출하는 쪽에서 절대경로로 넘겨야 합니다.
+    image_format이 None이면 Playwright가 확장자로 형식을 판단합니다.
+    """
+    shot_opts = _screenshot_options(image_format)
 
     # HTML에서 폰트 추출 (입력 HTML의 폰트 우선 사용)
     extracted_font = extract_font_family_from_html(table_html)
@@ -384,251 +491,422 @@ async def render_table_dual_images(
         table_bg="#ffffff",
     )
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page(
-            device_scale_factor=scale,
-            viewport={"width": 2200, "height": 2800},
-            locale="ko-KR",  # 한국어 로케일 설정
-        )
+    await page.set_content(html_doc, wait_until="domcontentloaded")
 
-        await page.set_content(html_doc, wait_until="domcontentloaded")
-        
-        # 폰트 렌더링 대기
-        await page.wait_for_timeout(100)
+    # CSS 주입, 래퍼(#shot) 생성, 렌더링 안정화, 기준 셀 크기 측정
+    await page.evaluate(
+        PREPARE_PAGE_JS,
+        {"fontCss": font_css, "baseCss": base_css, "mt": mt, "mr": mr, "mb": mb, "ml": ml},
+    )
 
-        if font_css:
-            await page.add_style_tag(content=font_css)
-            await page.evaluate("document.fonts && document.fonts.ready")
-            
-        await page.add_style_tag(content=base_css)
-
-        # 래퍼(#shot) 생성 및 패딩 적용
-        await page.evaluate(
-            """({mt, mr, mb, ml}) => {
-                const table = document.querySelector('table');
-                if (!table) throw new Error('No <table> found');
-
-                let shot = document.getElementById('shot');
-                if (!shot) {
-                    shot = document.createElement('div');
-                    shot.id = 'shot';
-                    document.body.prepend(shot);
-                }
-                shot.style.paddingTop = mt + 'px';
-                shot.style.paddingRight = mr + 'px';
-                shot.style.paddingBottom = mb + 'px';
-                shot.style.paddingLeft = ml + 'px';
-                shot.appendChild(table);
-            }""",
-            {"mt": mt, "mr": mr, "mb": mb, "ml": ml},
-        )
-        await page.wait_for_timeout(30)
-
-        # Base metrics 측정
-        base_metrics = await page.evaluate(MEASURE_JS)
-
-        # 1. 안전한 테마 찾기 (색칠 확률 고려)
-        should_apply_color = random.random() < color_probability
-        chosen = None
-        
-        if should_apply_color:
-            for _ in range(max_tries):
-                theme = choose_weighted_theme(THEMES)
-                await page.add_style_tag(content=build_theme_css(theme))
-                await page.wait_for_timeout(30)
-                cur_metrics = await page.evaluate(MEASURE_JS)
-
-                if within_5pct(base_metrics, cur_metrics, tol=tol):
-                    chosen = theme
-                    break
-        else:
-            # 색칠하지 않을 경우 기본 테마 사용
-            chosen = Theme("plain", "#222222", "#ffffff", "#111111", "#ffffff", "#ffffff", "none", False, 1.0)
-            await page.add_style_tag(content=build_theme_css(chosen))
+    # 1. 테마 적용 (색칠 확률 고려)
+    # 모든 테마는 색상/테두리색/그림자만 다르고 레이아웃에 영향을 주는 규칙
+    # (첫 행 굵게/가운데 정렬)은 동일하므로, 허용 오차 검사는 한 번이면 충분함.
+    # 한 테마가 실패하면 다른 테마도 똑같이 실패하므로 재시도하지 않음.
+    should_apply_color = random.random() < color_probability
+    if should_apply_color:
+        chosen = choose_weighted_theme(THEMES)
+    else:
+        # 색칠하지 않을 경우 기본 테마 사용
+        chosen = _PLAIN_THEME
 
-        if chosen is None:
-            await browser.close()
-            raise RuntimeError(f"Could not find a theme within tolerance.")
+    result = await page.evaluate(
+        APPLY_THEME_JS,
+        {"css": build_theme_css(chosen), "tol": tol, "check": should_apply_color},
+    )
+    if not result["ok"]:
+        raise RuntimeError(f"Theme '{chosen.name}' changes cell sizes beyond tolerance ({tol:.0%}).")
 
-        applied_font = await page.evaluate(
-            """() => getComputedStyle(document.querySelector('#shot') || document.body).fontFamily"""
-        )
-        shot = await page.query_selector("#shot")
-        
-        # 2. 기본 이미지 저장
-        await shot.screenshot(path=out_path_std, omit_background=False)
-
-        # 3. 유색 배경 이미지 생성 및 저장 (외부 배경만 변경 + 새로운 마진)
-        bg_color = get_random_pastel_color()
-        
-        # 배경색 이미지용 새로운 랜덤 마진 적용
-        new_margins = [random.randint(0, 5) for _ in range(4)]
-        new_mt, new_mr, new_mb, new_ml = new_margins
-        
-        await page.evaluate(f"""({{color, mt, mr, mb, ml}}) => {{
-            const shot = document.getElementById('shot');
-            // 래퍼의 배경색 변경 (표 내부는 원래 테마 유지)
-            shot.style.backgroundColor = color;
-            // 새로운 마진 적용
-            shot.style.paddingTop = mt + 'px';
-            shot.style.paddingRight = mr + 'px';
-            shot.style.paddingBottom = mb + 'px';
-            shot.style.paddingLeft = ml + 'px';
-        }}""", {"color": bg_color, "mt": new_mt, "mr": new_mr, "mb": new_mb, "ml": new_ml})
-        
-        await page.wait_for_timeout(30) # 렌더링 안정화
-        await shot.screenshot(path=out_path_colored, omit_background=False)
-        
-        await browser.close()
+    applied_font = result["font"]
+    shot = await page.query_selector("#shot")
+    
+    # 2. 기본 이미지 저장
+    await shot.screenshot(path=out_path_std, omit_background=False, **shot_opts)
+
+    if out_path_colored is None:
+        return chosen.name, applied_font, None
+
+    # 3. 유색 배경 이미지 생성 및 저장 (외부 배경만 변경 + 새로운 마진)
+    bg_color = get_random_pastel_color()
+    
+    # 배경색 이미지용 새로운 랜덤 마진 적용
+    new_margins = [random.randint(0, 5) for _ in range(4)]
+    new_mt, new_mr, new_mb, new_ml = new_margins
+    
+    await page.evaluate(f"""({{color, mt, mr, mb, ml}}) => {{
+        const shot = document.getElementById('shot');
+        // 래퍼의 배경색 변경 (표 내부는 원래 테마 유지)
+        shot.style.backgroundColor = color;
+        // 새로운 마진 적용
+        shot.style.paddingTop = mt + 'px';
+        shot.style.paddingRight = mr + 'px';
+        shot.style.paddingBottom = mb + 'px';
+        shot.style.paddingLeft = ml + 'px';
+    }}""", {"color": bg_color, "mt": new_mt, "mr": new_mr, "mb": new_mb, "ml": new_ml})
+
+    # 레이아웃은 그대로이고 배경/패딩만 바뀌므로 별도 대기 없이 바로 캡처
+    # (element screenshot이 자체적으로 안정된 프레임을 기다림)
+    await shot.screenshot(path=out_path_colored, omit_background=False, **shot_opts)
 
     return chosen.name, applied_font, new_margins
 
 
-# -----------------------------
-# Batch Processor
-# -----------------------------
-def process_all_html_files(
-    input_dir: str,
-    output_dir: str,
+async def render_table_dual_images(
+    table_html: str,
+    out_path_std: str,       # 기본 이미지 경로
+    out_path_colored: str,   # 배경색 추가 이미지 경로
     *,
     font_path: Optional[str] = None,
+    seed: Optional[int] = None,
     scale: float = 2.0,
-    overwrite: bool = False,
-    generate_colored: bool = True,
-    images_per_file: int = 1,
-    color_probability: float = 1.0,
-    raw_mode: bool = False,
-):
+    mt: int = 0, mr: int = 0, mb: int = 0, ml: int = 0,
+    tol: float = 0.05,
+    max_tries: int = 20,  # 사용하지 않음 (테마는 한 번만 적용), 기존 호출 호환을 위해 인자만 허용
+    color_probability: float = 1.0,  # 색칠 확률 (0.0~1.0)
+) -> Tuple[str, str, List[int]]:
+    
+    if seed is not None:
+        random.seed(seed)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            context = await _new_context(browser, scale)
+            page = await context.new_page()
+            return await _render_on_page(
+                page,
+                table_html,
+                str(Path(out_path_std).resolve()),
+                str(Path(out_path_colored).resolve()),
+                font_path=font_path,
+                mt=mt, mr=mr, mb=mb, ml=ml,
+                tol=tol,
+                color_probability=color_probability,
+            )
+        finally:
+            await browser.close()
+
+
+# -----------------------------
+# Batch Processor
+# -----------------------------
+def _collect_html_files(input_dir: str, output_dir: str) -> Tuple[List[Path], Path]:
+    """입력 폴더의 HTML 파일 목록과 (생성 후 절대경로화한) 출력 폴더를 반환합니다."""
     inp = Path(input_dir)
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
+    # 출력 폴더는 한 번만 절대경로화 (파일마다 resolve하지 않음)
+    out = out.resolve()
 
     # 모든 html 파일 검색
     html_files = list(inp.glob("*.html"))
     print("Found", len(html_files), "HTML files in", inp)
     if not html_files:
         print(f"No HTML files found in {inp}")
-        return
+        return html_files, out
 
     print(f"Found {len(html_files)} files. Starting conversion...")
+    return html_files, out
 
-    for i, html_file in enumerate(html_files):
-        table_html = html_file.read_text(encoding="utf-8")
-        # 마크다운 코드블록 제거
-        table_html = clean_markdown_codeblocks(table_html)
-        # <caption> 태그 제거
-        table_html = remove_caption_tags(table_html)
-        
-        print(f"[{i+1}/{len(html_files)}] Processing {html_file.name}...")
 
-        # 각 HTML 파일당 여러 이미지 생성
-        for img_idx in range(images_per_file):
-            # Raw 모드: 변환 없이 그대로 저장
-            if raw_mode:
-                stem = html_file.stem
-                if images_per_file > 1:
-                    raw_out = out / f"{stem}_v{img_idx + 1}.png"
-                else:
-                    raw_out = out / f"{stem}.png"
-                
-                if not overwrite:
-                    counter = 1
-                    while raw_out.exists():
-                        if images_per_file > 1:
-                            raw_out = out / f"{stem}_v{img_idx + 1}_{counter}.png"
-                        else:
-                            raw_out = out / f"{stem}_{counter}.png"
-                        counter += 1
-                
-                try:
-                    asyncio.run(
-                        render_raw_html_image(
-                            table_html,
-                            str(raw_out),
-                            scale=scale,
-                        )
-                    )
-                    print(f"  -> v{img_idx + 1} Done (raw mode). Saved: {raw_out.name}")
-                except Exception as e:
-                    print(f"  -> v{img_idx + 1} Failed: {e}")
-                continue
+# 파일 하나의 출력 경로 목록: 이미지 번호 순서대로 (기본 이미지 경로, 색칠 이미지 경로 또는 None)
+OutputPaths = List[Tuple[Path, Optional[Path]]]
 
-            # 랜덤 마진 설정 (1~5)
-            margins = [random.randint(1, 5) for _ in range(4)]
-            mt, mr, mb, ml = margins
 
+def _resolve_output_paths(
+    html_files: List[Path],
+    out: Path,
+    *,
+    overwrite: bool,
+    generate_colored: bool,
+    images_per_file: int,
+    raw_mode: bool,
+    ext: str,
+) -> List[OutputPaths]:
+    """
+    렌더링 전에 모든 입력 파일의 출력 경로를 한 곳에서 정합니다.
+    기존 파일과 이번 실행에서 이미 배정한 이름을 모두 피하므로
+    여러 프로세스로 나눠 렌더링해도 서로의 출력을 덮어쓰지 않습니다.
+    """
+    # 기존 출력 파일명을 한 번에 수집 (파일마다 exists()를 호출하지 않음).
+    # 이번 실행에서 배정한 이름도 여기에 추가해 중복을 막음.
+    existing = set() if overwrite else {entry.name for entry in os.scandir(out)}
+    with_colored = generate_colored and not raw_mode
+
+    resolved: List[OutputPaths] = []
+    for html_file in html_files:
+        paths: OutputPaths = []
+        for img_idx in range(images_per_file):
             # 파일명 기반 출력 경로 설정
-            stem = html_file.stem
-            if images_per_file > 1:
-                std_out = out / f"{stem}_v{img_idx + 1}.png"
-                clr_out = out / f"{stem}_v{img_idx + 1}_colored.png"
-            else:
-                std_out = out / f"{stem}.png"
-                clr_out = out / f"{stem}_colored.png"
+            base = f"{html_file.stem}_v{img_idx + 1}" if images_per_file > 1 else html_file.stem
+            std_out = out / f"{base}.{ext}"
+            clr_out = out / f"{base}_colored.{ext}"
 
             # 파일 덮어쓰기 확인
             if not overwrite:
                 counter = 1
-                original_std = std_out
-                original_clr = clr_out
-                while std_out.exists() or (generate_colored and clr_out.exists()):
-                    if images_per_file > 1:
-                        std_out = out / f"{stem}_v{img_idx + 1}_{counter}.png"
-                        clr_out = out / f"{stem}_v{img_idx + 1}_{counter}_colored.png"
-                    else:
-                        std_out = out / f"{stem}_{counter}.png"
-                        clr_out = out / f"{stem}_{counter}_colored.png"
+                while std_out.name in existing or (with_colored and clr_out.name in existing):
+                    std_out = out / f"{base}_{counter}.{ext}"
+                    clr_out = out / f"{base}_{counter}_colored.{ext}"
                     counter += 1
+                existing.add(std_out.name)
+                if with_colored:
+                    existing.add(clr_out.name)
 
-            try:
-                if generate_colored:
-                    theme_name, _, new_margins = asyncio.run(
-                        render_table_dual_images(
-                            table_html,
-                            str(std_out),
-                            str(clr_out),
-                            font_path=font_path,
-                            scale=scale,
-                            mt=mt, mr=mr, mb=mb, ml=ml,
-                            tol=0.05,
-                            max_tries=30,
-                            color_probability=color_probability
-                        )
-                    )
-                    print(f"  -> v{img_idx + 1} Done. Theme: {theme_name}, Margins: {margins} → Colored: {new_margins}")
-                    print(f"  -> Saved: {std_out.name}, {clr_out.name}")
-                else:
-                    # 기본 이미지만 생성
-                    theme_name, _ = asyncio.run(
-                        render_table_single_image(
-                            table_html,
-                            str(std_out),
-                            font_path=font_path,
-                            scale=scale,
-                            mt=mt, mr=mr, mb=mb, ml=ml,
-                            tol=0.05,
-                            max_tries=30,
-                            color_probability=color_probability
-                        )
+            paths.append((std_out, clr_out if with_colored else None))
+        resolved.append(paths)
+    return resolved
+
+
+def _prepare_jobs(
+    input_dir: str,
+    output_dir: str,
+    *,
+    overwrite: bool,
+    generate_colored: bool,
+    images_per_file: int,
+    raw_mode: bool,
+    image_format: str,
+) -> List[Tuple[int, Path, OutputPaths]]:
+    """입력 파일을 찾고 파일별 (번호, 경로, 출력 경로 목록) 작업 목록을 만듭니다."""
+    html_files, out = _collect_html_files(input_dir, output_dir)
+    if not html_files:
+        return []
+    outputs = _resolve_output_paths(
+        html_files,
+        out,
+        overwrite=overwrite,
+        generate_colored=generate_colored,
+        images_per_file=images_per_file,
+        raw_mode=raw_mode,
+        ext=IMAGE_EXTENSIONS[image_format],
+    )
+    return [(i, html_file, paths) for i, (html_file, paths) in enumerate(zip(html_files, outputs))]
+
+
+async def _render_files_async(
+    jobs: List[Tuple[int, Path, OutputPaths]],
+    total: int,
+    *,
+    font_path: Optional[str] = None,
+    scale: float = 2.0,
+    color_probability: float = 1.0,
+    raw_mode: bool = False,
+    concurrency: Optional[int] = None,
+    image_format: str = "png",
+) -> None:
+    """
+    브라우저를 한 번만 띄우고 주어진 작업 목록을 같은 컨텍스트에서 렌더링합니다.
+    출력 경로는 _resolve_output_paths에서 미리 정해져 있습니다.
+    최대 concurrency개의 파일을 동시에 처리합니다 (기본값: CPU 코어 수).
+    페이지는 미리 concurrency개를 열어 두고 파일 간에 재사용합니다.
+    """
+    concurrency = max(1, concurrency or os.cpu_count() or 1)
+
+    async def work(i: int, html_file: Path, outputs: OutputPaths, context, pages: asyncio.Queue) -> None:
+        # 동시에 처리되는 파일들의 출력이 섞이지 않도록 파일 단위로 모아서 출력
+        logs: List[str] = []
+        # 페이지 풀에서 하나를 빌려 씀 (풀 크기가 곧 동시 처리 수)
+        page = await pages.get()
+        try:
+            table_html = html_file.read_text(encoding="utf-8")
+            # 마크다운 코드블록 제거
+            table_html = clean_markdown_codeblocks(table_html)
+            # <caption> 태그 제거
+            table_html = remove_caption_tags(table_html)
+            
+            logs.append(f"[{i+1}/{total}] Processing {html_file.name}...")
+
+            # 각 HTML 파일당 여러 이미지 생성
+            for img_idx, (std_out, clr_out) in enumerate(outputs):
+                # Raw 모드: 변환 없이 그대로 저장
+                if raw_mode:
+                    try:
+                        await _render_raw_on_page(page, table_html, str(std_out), image_format=image_format)
+                        logs.append(f"  -> v{img_idx + 1} Done (raw mode). Saved: {std_out.name}")
+                    except Exception as e:
+                        logs.append(f"  -> v{img_idx + 1} Failed: {e}")
+                    continue
+
+                # 랜덤 마진 설정 (1~5)
+                margins = [random.randint(1, 5) for _ in range(4)]
+                mt, mr, mb, ml = margins
+
+                try:
+                    theme_name, _, new_margins = await _render_on_page(
+                        page,
+                        table_html,
+                        str(std_out),
+                        str(clr_out) if clr_out is not None else None,
+                        font_path=font_path,
+                        mt=mt, mr=mr, mb=mb, ml=ml,
+                        tol=0.05,
+                        color_probability=color_probability,
+                        image_format=image_format,
                     )
-                    print(f"  -> v{img_idx + 1} Done. Theme: {theme_name}, Margins: {margins}")
-                    print(f"  -> Saved: {std_out.name}")
-                
-            except Exception as e:
-                print(f"  -> v{img_idx + 1} Failed: {e}")
+                    if clr_out is not None:
+                        logs.append(f"  -> v{img_idx + 1} Done. Theme: {theme_name}, Margins: {margins} → Colored: {new_margins}")
+                        logs.append(f"  -> Saved: {std_out.name}, {clr_out.name}")
+                    else:
+                        logs.append(f"  -> v{img_idx + 1} Done. Theme: {theme_name}, Margins: {margins}")
+                        logs.append(f"  -> Saved: {std_out.name}")
+                    
+                except Exception as e:
+                    logs.append(f"  -> v{img_idx + 1} Failed: {e}")
+        finally:
+            # 페이지가 크래시 등으로 닫혔으면 새 페이지로 교체해 풀에 반납
+            if page.is_closed():
+                page = await context.new_page()
+            pages.put_nowait(page)
+
+        print("\n".join(logs))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            context = await _new_context(browser, scale)
+            pages: asyncio.Queue = asyncio.Queue()
+            for _ in range(min(concurrency, len(jobs))):
+                pages.put_nowait(await context.new_page())
+            await asyncio.gather(
+                *(work(i, html_file, outputs, context, pages) for i, html_file, outputs in jobs)
+            )
+        finally:
+            await browser.close()
+
+
+def _render_shard(
+    jobs: List[Tuple[int, Path, OutputPaths]],
+    total: int,
+    theme_weights: List[float],
+    render_options: Dict[str, object],
+) -> int:
+    """ProcessPoolExecutor 워커: 자체 이벤트 루프와 브라우저로 작업 묶음을 렌더링합니다."""
+    # fork된 워커는 부모의 난수 상태를 그대로 물려받으므로 다시 시드
+    random.seed()
+    # spawn 방식에서는 CLI로 바꾼 테마 가중치가 전달되지 않으므로 명시적으로 적용
+    set_theme_weights(theme_weights)
+    asyncio.run(_render_files_async(jobs, total, **render_options))
+    return len(jobs)
+
+
+async def process_all_html_files_async(
+    input_dir: str,
+    output_dir: str,
+    *,
+    font_path: Optional[str] = None,
+    scale: float = 2.0,
+    overwrite: bool = False,
+    generate_colored: bool = True,
+    images_per_file: int = 1,
+    color_probability: float = 1.0,
+    raw_mode: bool = False,
+    concurrency: Optional[int] = None,
+    image_format: str = "png",
+) -> None:
+    """한 프로세스에서 모든 HTML 파일을 렌더링합니다."""
+    jobs = _prepare_jobs(
+        input_dir,
+        output_dir,
+        overwrite=overwrite,
+        generate_colored=generate_colored,
+        images_per_file=images_per_file,
+        raw_mode=raw_mode,
+        image_format=image_format,
+    )
+    if jobs:
+        await _render_files_async(
+            jobs,
+            len(jobs),
+            font_path=font_path,
+            scale=scale,
+            color_probability=color_probability,
+            raw_mode=raw_mode,
+            concurrency=concurrency,
+            image_format=image_format,
+        )
+
+
+def process_all_html_files(
+    input_dir: str,
+    output_dir: str,
+    *,
+    font_path: Optional[str] = None,
+    scale: float = 2.0,
+    overwrite: bool = False,
+    generate_colored: bool = True,
+    images_per_file: int = 1,
+    color_probability: float = 1.0,
+    raw_mode: bool = False,
+    concurrency: Optional[int] = None,
+    image_format: str = "png",
+    processes: int = 1,
+) -> None:
+    """
+    process_all_html_files_async의 동기 래퍼 (이벤트 루프는 한 번만 생성).
+    processes가 2 이상이면 파일을 나눠 여러 프로세스에서 각자의 브라우저로 렌더링합니다.
+    """
+    if processes <= 1:
+        asyncio.run(process_all_html_files_async(
+            input_dir,
+            output_dir,
+            font_path=font_path,
+            scale=scale,
+            overwrite=overwrite,
+            generate_colored=generate_colored,
+            images_per_file=images_per_file,
+            color_probability=color_probability,
+            raw_mode=raw_mode,
+            concurrency=concurrency,
+            image_format=image_format,
+        ))
+        return
+
+    # 출력 파일명은 나누기 전에 부모에서 모두 정해 둠 (워커끼리 같은 이름을 쓰지 않도록)
+    jobs = _prepare_jobs(
+        input_dir,
+        output_dir,
+        overwrite=overwrite,
+        generate_colored=generate_colored,
+        images_per_file=images_per_file,
+        raw_mode=raw_mode,
+        image_format=image_format,
+    )
+    if not jobs:
+        return
+
+    processes = min(processes, len(jobs))
+    render_options: Dict[str, object] = {
+        "font_path": font_path,
+        "scale": scale,
+        "color_probability": color_probability,
+        "raw_mode": raw_mode,
+        # 프로세스마다 페이지 풀을 두므로, 지정이 없으면 CPU 코어를 프로세스 수로 나눠 씀
+        "concurrency": concurrency or max(1, (os.cpu_count() or 1) // processes),
+        "image_format": image_format,
+    }
+    shards = [jobs[k::processes] for k in range(processes)]
+    theme_weights = [theme.weight for theme in THEMES]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_render_shard, shard, len(jobs), theme_weights, render_options)
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            future.result()
 
 
 # Raw 이미지 생성 (변환 없이 그대로)
-async def render_raw_html_image(
+async def _render_raw_on_page(
+    page,
     html_content: str,
     out_path: str,
     *,
-    scale: float = 2.0,
+    image_format: Optional[str] = None,
 ) -> None:
-    """HTML을 아무런 변환 없이 그대로 이미지로 렌더링합니다."""
-    out_path = str(Path(out_path).resolve())
-    
+    """이미 열려 있는 페이지에서 HTML을 아무런 변환 없이 렌더링합니다."""
+    shot_opts = _screenshot_options(image_format)
     # HTML에서 폰트 추출
     extracted_font = extract_font_family_from_html(html_content)
     
@@ -646,7 +924,7 @@ async def render_raw_html_image(
   </style>"""
     
     # HTML이 완전한 문서가 아니면 기본 래퍼 추가
-    if not html_content.strip().lower().startswith('<!doctype') and not html_content.strip().lower().startswith('<html'):
+    if not _DOC_START_RE.match(html_content):
         html_content = f"""<!doctype html>
 <html lang="ko">
 <head>
@@ -659,34 +937,44 @@ async def render_raw_html_image(
 </html>"""
     else:
         # 완전한 HTML 문서에도 폰트 스타일 삽입 (</head> 앞에)
-        if '</head>' in html_content.lower():
-            insert_pos = html_content.lower().find('</head>')
+        m = _HEAD_CLOSE_RE.search(html_content)
+        if m:
+            insert_pos = m.start()
             html_content = html_content[:insert_pos] + font_override_style + html_content[insert_pos:]
-        elif '<body' in html_content.lower():
-            # <head>가 없으면 <body> 앞에 삽입
-            insert_pos = html_content.lower().find('<body')
-            html_content = html_content[:insert_pos] + f"<head>{font_override_style}</head>" + html_content[insert_pos:]
+        else:
+            m = _BODY_OPEN_RE.search(html_content)
+            if m:
+                # <head>가 없으면 <body> 앞에 삽입
+                insert_pos = m.start()
+                html_content = html_content[:insert_pos] + f"<head>{font_override_style}</head>" + html_content[insert_pos:]
+
+    await page.set_content(html_content, wait_until="domcontentloaded")
+    await page.evaluate(SETTLE_JS)
+
+    # 테이블이 있으면 테이블만, 없으면 body 전체 캡처
+    table = await page.query_selector('table')
+    if table:
+        await table.screenshot(path=out_path, omit_background=False, **shot_opts)
+    else:
+        body = await page.query_selector('body')
+        await body.screenshot(path=out_path, omit_background=False, **shot_opts)
+
 
+async def render_raw_html_image(
+    html_content: str,
+    out_path: str,
+    *,
+    scale: float = 2.0,
+) -> None:
+    """HTML을 아무런 변환 없이 그대로 이미지로 렌더링합니다."""
     async with async_playwright() as p:
         browser = await p.chromium.launch()
-        page = await browser.new_page(
-            device_scale_factor=scale,
-            viewport={"width": 2200, "height": 2800},
-            locale="ko-KR",  # 한국어 로케일 설정
-        )
-
-        await page.set_content(html_content, wait_until="domcontentloaded")
-        await page.wait_for_timeout(100)
-
-        # 테이블이 있으면 테이블만, 없으면 body 전체 캡처
-        table = await page.query_selector('table')
-        if table:
-            await table.screenshot(path=out_path, omit_background=False)
-        else:
-            body = await page.query_selector('body')
-            await body.screenshot(path=out_path, omit_background=False)
-        
-        await browser.close()
+        try:
+            context = await _new_context(browser, scale)
+            page = await context.new_page()
+            await _render_raw_on_page(page, html_content, str(Path(out_path).resolve()))
+        finally:
+            await browser.close()
 
 
 # 단일 이미지 생성용 함수 추가
@@ -699,110 +987,32 @@ async def render_table_single_image(
     scale: float = 2.0,
     mt: int = 0, mr: int = 0, mb: int = 0, ml: int = 0,
     tol: float = 0.05,
-    max_tries: int = 20,
+    max_tries: int = 20,  # 사용하지 않음 (테마는 한 번만 적용), 기존 호출 호환을 위해 인자만 허용
     color_probability: float = 1.0,
 ) -> Tuple[str, str]:
     
     if seed is not None:
         random.seed(seed)
 
-    out_path = str(Path(out_path).resolve())
-    
-    # HTML에서 폰트 추출 (입력 HTML의 폰트 우선 사용)
-    extracted_font = extract_font_family_from_html(table_html)
-    
-    html_doc = wrap_table_fragment(table_html, font_family=extracted_font)
-    
-    font_css = ""
-    target_font_family = extracted_font  # HTML에서 추출한 폰트 사용
-    if font_path:
-        # 외부 폰트 파일이 지정된 경우 그것을 우선 사용
-        target_font_family = "MyKR"
-        font_css = font_face_base64(font_path, family=target_font_family)
-
-    base_css = build_size_fixed_base_css(
-        font_family=target_font_family,
-        font_size_px=12,
-        line_height=1.25,
-        cell_padding_px=6,
-        border_width_px=1,
-        border_style="solid",
-        page_bg="#ffffff",
-        table_bg="#ffffff",
-    )
-
     async with async_playwright() as p:
         browser = await p.chromium.launch()
-        page = await browser.new_page(
-            device_scale_factor=scale,
-            viewport={"width": 2200, "height": 2800},
-            locale="ko-KR",  # 한국어 로케일 설정
-        )
-
-        await page.set_content(html_doc, wait_until="domcontentloaded")
-        
-        # 폰트 렌더링 대기
-        await page.wait_for_timeout(100)
-
-        if font_css:
-            await page.add_style_tag(content=font_css)
-            await page.evaluate("document.fonts && document.fonts.ready")
-            
-        await page.add_style_tag(content=base_css)
-
-        await page.evaluate(
-            """({mt, mr, mb, ml}) => {
-                const table = document.querySelector('table');
-                if (!table) throw new Error('No <table> found');
-
-                let shot = document.getElementById('shot');
-                if (!shot) {
-                    shot = document.createElement('div');
-                    shot.id = 'shot';
-                    document.body.prepend(shot);
-                }
-                shot.style.paddingTop = mt + 'px';
-                shot.style.paddingRight = mr + 'px';
-                shot.style.paddingBottom = mb + 'px';
-                shot.style.paddingLeft = ml + 'px';
-                shot.appendChild(table);
-            }""",
-            {"mt": mt, "mr": mr, "mb": mb, "ml": ml},
-        )
-        await page.wait_for_timeout(30)
-
-        base_metrics = await page.evaluate(MEASURE_JS)
-
-        should_apply_color = random.random() < color_probability
-        chosen = None
-        
-        if should_apply_color:
-            for _ in range(max_tries):
-                theme = choose_weighted_theme(THEMES)
-                await page.add_style_tag(content=build_theme_css(theme))
-                await page.wait_for_timeout(30)
-                cur_metrics = await page.evaluate(MEASURE_JS)
-
-                if within_5pct(base_metrics, cur_metrics, tol=tol):
-                    chosen = theme
-                    break
-        else:
-            chosen = Theme("plain", "#222222", "#ffffff", "#111111", "#ffffff", "#ffffff", "none", False, 1.0)
-            await page.add_style_tag(content=build_theme_css(chosen))
-
-        if chosen is None:
+        try:
+            context = await _new_context(browser, scale)
+            page = await context.new_page()
+            theme_name, applied_font, _ = await _render_on_page(
+                page,
+                table_html,
+                str(Path(out_path).resolve()),
+                None,
+                font_path=font_path,
+                mt=mt, mr=mr, mb=mb, ml=ml,
+                tol=tol,
+                color_probability=color_probability,
+            )
+        finally:
             await browser.close()
-            raise RuntimeError(f"Could not find a theme within tolerance.")
-
-        applied_font = await page.evaluate(
-            """() => getComputedStyle(document.querySelector('#shot') || document.body).fontFamily"""
-        )
-        shot = await page.query_selector("#shot")
-        
-        await shot.screenshot(path=out_path, omit_background=False)
-        await browser.close()
 
-    return chosen.name, applied_font
+    return theme_name, applied_font
 
 
 if __name__ == "__main__":
@@ -821,13 +1031,18 @@ if __name__ == "__main__":
                        help="Weights for themes: gray_clean soft_card blue_header mono")
     parser.add_argument("--raw", action="store_true", 
                        help="Convert HTML to image without any transformation (no themes, fonts, margins)")
+    parser.add_argument("--format", choices=sorted(IMAGE_EXTENSIONS), default="png",
+                       help="Output image format (jpeg is faster to encode and smaller)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                       help="Number of HTML files rendered concurrently (default: CPU count)")
+    parser.add_argument("--processes", type=int, default=1,
+                       help="Number of worker processes, each with its own browser (default: 1)")
     
     args = parser.parse_args()
     
     # 테마 가중치 업데이트
     if len(args.theme_weights) == 4:
-        for i, weight in enumerate(args.theme_weights):
-            THEMES[i] = replace(THEMES[i], weight=weight)
+        set_theme_weights(args.theme_weights)
     
     # 설정 출력
     print("=" * 50)
@@ -844,6 +1059,9 @@ if __name__ == "__main__":
     print(f"Scale: {args.scale}x")
     print(f"Overwrite: {args.overwrite}")
     print(f"Images per file: {args.count}")
+    print(f"Format: {args.format}")
+    print(f"Concurrency: {args.concurrency or os.cpu_count()}")
+    print(f"Processes: {args.processes}")
     print("-" * 50)
     
     process_all_html_files(
@@ -856,4 +1074,7 @@ if __name__ == "__main__":
         images_per_file=args.count,
         color_probability=args.color_probability,
         raw_mode=args.raw,
+        concurrency=args.concurrency,
+        image_format=args.format,
+        processes=args.processes,
     )
\ No newline at end of file
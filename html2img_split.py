@@ -5,13 +5,18 @@ HTML을 이미지로 변환하는 스크립트
 """
 
 import asyncio
+import logging
 import os
 import re
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from html_utils import clean_markdown_codeblocks, extract_font_family_from_html
+
+log = logging.getLogger(__name__)
 
 
 # -----------------------------
@@ -27,24 +32,14 @@ DEFAULT_KOREAN_FONTS = (
     "sans-serif"
 )
 
+# 정규식은 모듈 로드 시 한 번만 컴파일
+_CAPTION_RE = re.compile(r'<caption[^>]*>.*?</caption>\s*', re.DOTALL | re.IGNORECASE)
 
-def extract_font_family_from_html(html_content: str) -> Optional[str]:
-    """
-    HTML 내용에서 font-family CSS 속성을 추출합니다.
-    """
-    patterns = [
-        r"font-family\s*:\s*([^;}{]+)[;}]",
-        r"font-family\s*=\s*['\"]([^'\"]+)['\"]",
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
-        if matches:
-            font_family = matches[0].strip().replace('"', "'").strip()
-            if font_family:
-                return font_family
-    
-    return None
+# 완전한 HTML 문서 여부 및 폰트 스타일 삽입 위치 탐색용
+# (str.lower()는 'İ'처럼 길이가 바뀌는 문자가 있어 소문자 사본의 위치를 원문에 쓸 수 없음)
+_DOC_START_RE = re.compile(r"\s*<(?:!doctype|html)", re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(r"</head>", re.IGNORECASE)
+_BODY_OPEN_RE = re.compile(r"<body", re.IGNORECASE)
 
 
 @dataclass
@@ -56,28 +51,22 @@ class RowInfo:
     height: float
 
 
-def clean_markdown_codeblocks(content: str) -> str:
-    """HTML 내용에서 마크다운 코드블록(```html ... ```)을 제거합니다."""
-    content = content.strip()
-    
-    if content.startswith("```"):
-        lines = content.split("\n")
-        lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
-    
-    return content.strip()
+@dataclass
+class TableLayout:
+    """테이블 레이아웃 정보 (행 위치는 테이블 top 기준 상대값)"""
+    rows: List[RowInfo]
+    height: float
+    width: float
+    top: float
+    left: float
 
 
 def remove_caption_tags(content: str) -> str:
     """
     HTML 내용에서 <caption>...</caption> 태그를 제거합니다.
     """
-    import re
     # <caption>...</caption> 태그 전체 제거 (줄바꿈 포함)
-    content = re.sub(r'<caption[^>]*>.*?</caption>\s*', '', content, flags=re.DOTALL | re.IGNORECASE)
-    return content
+    return _CAPTION_RE.sub('', content)
 
 
 def wrap_html_document(html_content: str, font_family: Optional[str] = None) -> str:
@@ -89,26 +78,24 @@ def wrap_html_document(html_content: str, font_family: Optional[str] = None) ->
     else:
         font_css = f"font-family: {DEFAULT_KOREAN_FONTS};"
     
-    # 폰트 강제 적용을 위한 스타일 태그
+    # 폰트 적용을 위한 스타일 태그 (그 외 요소는 상속으로 적용되므로 전체 선택자 * 는 쓰지 않음)
     font_override_style = f"""<style>
-    * {{ {font_css} !important; }}
-    body {{ {font_css} }}
-    table, th, td {{ {font_css} }}
+    body, table, th, td {{ {font_css} }}
   </style>"""
     
     # 이미 완전한 HTML 문서인 경우 폰트 스타일만 삽입
-    stripped = html_content.strip().lower()
-    if stripped.startswith('<!doctype') or stripped.startswith('<html'):
-        # </head> 앞에 스타일 삽입
-        if '</head>' in html_content.lower():
-            insert_pos = html_content.lower().find('</head>')
-            return html_content[:insert_pos] + font_override_style + html_content[insert_pos:]
-        elif '<body' in html_content.lower():
+    if _DOC_START_RE.match(html_content):
+        m = _HEAD_CLOSE_RE.search(html_content)
+        if m:
+            # </head> 앞에 스타일 삽입
+            idx = m.start()
+            return html_content[:idx] + font_override_style + html_content[idx:]
+        m = _BODY_OPEN_RE.search(html_content)
+        if m:
             # <head>가 없으면 <body> 앞에 삽입
-            insert_pos = html_content.lower().find('<body')
-            return html_content[:insert_pos] + f"<head>{font_override_style}</head>" + html_content[insert_pos:]
-        else:
-            return html_content  # 구조가 이상하면 그대로 반환
+            idx = m.start()
+            return html_content[:idx] + f"<head>{font_override_style}</head>" + html_content[idx:]
+        return html_content  # 구조가 이상하면 그대로 반환
     
     return f"""<!doctype html>
 <html lang="ko">
@@ -121,11 +108,9 @@ def wrap_html_document(html_content: str, font_family: Optional[str] = None) ->
       margin: 0;
       padding: 10px;
       background: white;
-      {font_css}
     }}
     table {{
       border-collapse: collapse;
-      {font_css}
       font-size: 12px;
     }}
     th, td {{
@@ -147,10 +132,10 @@ def wrap_html_document(html_content: str, font_family: Optional[str] = None) ->
 </html>"""
 
 
-async def get_table_row_positions(page) -> Tuple[List[RowInfo], float, float]:
+async def get_table_row_positions(page) -> TableLayout:
     """
-    테이블의 각 행(tr)의 위치 정보를 가져옵니다.
-    Returns: (행 정보 리스트, 테이블 전체 높이, 테이블 너비)
+    테이블의 각 행(tr)의 위치와 테이블 자체의 위치/크기를 한 번의 evaluate로 가져옵니다.
+    테이블이 없으면 rows가 빈 TableLayout을 반환합니다.
     """
     result = await page.evaluate("""
     () => {
@@ -182,10 +167,15 @@ async def get_table_row_positions(page) -> Tuple[List[RowInfo], float, float]:
     """)
     
     if result is None:
-        return [], 0, 0
-    
-    rows = [RowInfo(**r) for r in result['rows']]
-    return rows, result['tableHeight'], result['tableWidth']
+        return TableLayout(rows=[], height=0, width=0, top=0, left=0)
+    
+    return TableLayout(
+        rows=[RowInfo(**r) for r in result['rows']],
+        height=result['tableHeight'],
+        width=result['tableWidth'],
+        top=result['tableTop'],
+        left=result['tableLeft'],
+    )
 
 
 def calculate_split_points(rows: List[RowInfo], max_height: float) -> List[Tuple[int, int]]:
@@ -217,27 +207,130 @@ def calculate_split_points(rows: List[RowInfo], max_height: float) -> List[Tuple
     return splits
 
 
-async def render_html_with_split(
+def _load_and_clean(html_file: Path) -> str:
+    """HTML 파일을 읽고 코드블록/캡션을 정리합니다 (작업 스레드에서 실행)."""
+    html_content = html_file.read_text(encoding="utf-8")
+    html_content = clean_markdown_codeblocks(html_content)
+    return remove_caption_tags(html_content)
+
+
+PAGE_VIEWPORT = {"width": 2200, "height": 4000}
+
+# 정적 HTML 스크린샷에 필요 없는 Chromium 기능 비활성화 (시작 시간/페이지당 메모리 절감)
+# 일부는 Playwright 기본 인자와 겹치지만 명시적으로 유지. --no-sandbox는 보안상 넣지 않음.
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--hide-scrollbars",
+    "--mute-audio",
+]
+
+# 렌더링 준비 완료 조건: 웹폰트 로딩이 끝나고 테이블(있다면)이 레이아웃된 상태.
+# 폰트가 늦게 적용되면 행 높이가 바뀌어 분할 지점이 틀어지므로 폰트까지 기다림.
+READY_JS = """
+() => {
+    if (document.fonts.status !== 'loaded') return false;
+    const t = document.querySelector('table');
+    return !t || t.getBoundingClientRect().height > 0;
+}
+"""
+READY_TIMEOUT_MS = 3000
+
+IMAGE_EXTENSIONS = {"png": "png", "jpeg": "jpg"}
+JPEG_QUALITY = 85
+
+
+def _screenshot_options(image_format: Optional[str]) -> Dict[str, object]:
+    """스크린샷 형식 옵션을 반환합니다. None이면 경로 확장자로 판단하도록 비워 둡니다."""
+    if image_format == "jpeg":
+        return {"type": "jpeg", "quality": JPEG_QUALITY}
+    if image_format:
+        return {"type": image_format}
+    return {}
+
+
+async def _new_context(browser, scale: float):
+    """렌더링에 사용할 브라우저 컨텍스트를 생성합니다."""
+    return await browser.new_context(
+        device_scale_factor=scale,
+        viewport=PAGE_VIEWPORT,
+        locale="ko-KR",
+        service_workers="block",  # 정적 테이블이므로 서비스 워커 불필요
+    )
+
+
+class PlaywrightSession:
+    """
+    Playwright 드라이버와 브라우저를 처음 사용할 때 한 번만 띄우고 재사용하는 세션.
+    `async with PlaywrightSession(...) as session:` 형태로 사용합니다.
+    browsers개의 브라우저를 띄우고 get_page()마다 번갈아 가며 새 페이지를 엽니다.
+    """
+
+    def __init__(self, *, scale: float = 2.0, browsers: int = 1):
+        self.scale = scale
+        self.browsers = max(1, browsers)
+        self._playwright = None
+        self._browsers = []
+        self._contexts = []
+        self._next = 0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "PlaywrightSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _start(self) -> None:
+        # 동시에 여러 작업이 get_page()를 호출해도 한 번만 시작
+        async with self._lock:
+            if self._contexts:
+                return
+            self._playwright = await async_playwright().start()
+            self._browsers = await asyncio.gather(
+                *(self._playwright.chromium.launch(args=LAUNCH_ARGS) for _ in range(self.browsers))
+            )
+            self._contexts = await asyncio.gather(
+                *(_new_context(b, self.scale) for b in self._browsers)
+            )
+
+    async def get_page(self):
+        """지속 컨텍스트에서 새 페이지를 엽니다 (브라우저는 라운드 로빈으로 선택)."""
+        if not self._contexts:
+            await self._start()
+        context = self._contexts[self._next % len(self._contexts)]
+        self._next += 1
+        return await context.new_page()
+
+    async def close(self) -> None:
+        """브라우저와 Playwright 드라이버를 종료합니다."""
+        await asyncio.gather(*(b.close() for b in self._browsers))
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._playwright = None
+        self._browsers = []
+        self._contexts = []
+
+
+async def _render_on_page(
+    page,
     html_content: str,
     output_path: str,
     *,
     max_height: int = 2000,
-    scale: float = 2.0,
     padding: int = 10,
+    image_format: Optional[str] = None,
 ) -> List[str]:
     """
-    HTML을 이미지로 렌더링하고, 필요시 행 단위로 분할합니다.
-    
-    Args:
-        html_content: HTML 내용
-        output_path: 출력 파일 경로 (분할 시 _1, _2 등이 추가됨)
-        max_height: 이미지 최대 높이 (픽셀)
-        scale: 이미지 스케일
-        padding: 여백
-    
-    Returns:
-        생성된 이미지 파일 경로 리스트
+    이미 열려 있는 페이지에서 HTML을 렌더링하고, 필요시 행 단위로 분할합니다.
+    인자와 반환값은 render_html_with_split과 같습니다 (scale은 페이지 설정을 따름).
     """
+    shot_options = _screenshot_options(image_format)
     output_path = Path(output_path).resolve()
     output_dir = output_path.parent
     output_stem = output_path.stem
@@ -249,96 +342,159 @@ async def render_html_with_split(
     extracted_font = extract_font_family_from_html(html_content)
     html_doc = wrap_html_document(html_content, font_family=extracted_font)
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page(
-            device_scale_factor=scale,
-            viewport={"width": 2200, "height": 4000},
-            locale="ko-KR",
-        )
-        
-        await page.set_content(html_doc, wait_until="domcontentloaded")
-        await page.wait_for_timeout(100)
-        
-        # 테이블 행 위치 정보 가져오기
-        rows, table_height, table_width = await get_table_row_positions(page)
-        
-        # 테이블이 없는 경우 전체 페이지 캡처
-        if not rows:
-            body = await page.query_selector('body')
-            await body.screenshot(path=str(output_path), omit_background=False)
-            await browser.close()
-            return [str(output_path)]
-        
-        # 분할이 필요 없는 경우
-        if table_height <= max_height:
-            table = await page.query_selector('table')
-            await table.screenshot(path=str(output_path), omit_background=False)
-            await browser.close()
-            return [str(output_path)]
-        
-        # 분할 지점 계산
-        splits = calculate_split_points(rows, max_height)
+    await page.set_content(html_doc, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_function(READY_JS, timeout=READY_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass  # 준비 신호가 오지 않아도 현재 상태로 진행 (기존 고정 대기와 동일한 동작)
+    
+    # 테이블 행 위치 정보 가져오기
+    layout = await get_table_row_positions(page)
+    rows = layout.rows
+    
+    # 테이블이 없는 경우 전체 페이지 캡처
+    if not rows:
+        body = await page.query_selector('body')
+        await body.screenshot(path=str(output_path), omit_background=False, **shot_options)
+        return [str(output_path)]
+    
+    # 분할이 필요 없는 경우
+    if layout.height <= max_height:
+        table = await page.query_selector('table')
+        await table.screenshot(path=str(output_path), omit_background=False, **shot_options)
+        return [str(output_path)]
+    
+    # 분할 지점 계산
+    splits = calculate_split_points(rows, max_height)
+    
+    if len(splits) == 1:
+        # 분할이 필요 없음
+        table = await page.query_selector('table')
+        await table.screenshot(path=str(output_path), omit_background=False, **shot_options)
+        return [str(output_path)]
+    
+    # 각 분할 영역의 파일명과 클립 영역 계산
+    output_files = []
+    clips = []
+    # 분할별 상세 로그는 DEBUG에서만 (동시 렌더링 중 출력이 병목이 되지 않도록)
+    debug = log.isEnabledFor(logging.DEBUG)
+    
+    for part_idx, (start_row, end_row) in enumerate(splits, 1):
+        # 분할된 파일명 생성
+        part_path = output_dir / f"{output_stem}_{part_idx}{output_ext}"
         
-        if len(splits) == 1:
-            # 분할이 필요 없음
-            table = await page.query_selector('table')
-            await table.screenshot(path=str(output_path), omit_background=False)
-            await browser.close()
-            return [str(output_path)]
+        # 해당 행 범위의 클립 영역 계산
+        start_top = rows[start_row].top
+        end_bottom = rows[end_row].bottom
         
-        # 각 분할 영역을 개별 이미지로 캡처
-        output_files = []
+        clips.append({
+            'x': layout.left - padding,
+            'y': layout.top + start_top - padding,
+            'width': layout.width + padding * 2,
+            'height': (end_bottom - start_top) + padding * 2,
+        })
         
-        for part_idx, (start_row, end_row) in enumerate(splits, 1):
-            # 분할된 파일명 생성
-            part_path = output_dir / f"{output_stem}_{part_idx}{output_ext}"
-            
-            # 해당 행 범위의 클립 영역 계산
-            start_top = rows[start_row].top
-            end_bottom = rows[end_row].bottom
-            
-            # 테이블의 절대 위치 가져오기
-            table_rect = await page.evaluate("""
-            () => {
-                const table = document.querySelector('table');
-                const rect = table.getBoundingClientRect();
-                return { top: rect.top, left: rect.left, width: rect.width };
-            }
-            """)
-            
-            clip = {
-                'x': table_rect['left'] - padding,
-                'y': table_rect['top'] + start_top - padding,
-                'width': table_rect['width'] + padding * 2,
-                'height': (end_bottom - start_top) + padding * 2,
-            }
-            
-            await page.screenshot(
-                path=str(part_path),
-                clip=clip,
-                omit_background=False
+        output_files.append(str(part_path))
+        if debug:
+            log.debug(
+                "%s part %d: rows %d-%d, height=%.0fpx",
+                output_stem, part_idx, start_row + 1, end_row + 1, end_bottom - start_top,
             )
-            
-            output_files.append(str(part_path))
-            print(f"  Part {part_idx}: rows {start_row+1}-{end_row+1}, height={end_bottom - start_top:.0f}px")
-        
-        await browser.close()
+    
+    # 각 분할 영역을 개별 이미지로 순서대로 캡처
+    # (한 페이지의 스크린샷은 Playwright가 직렬화하므로 gather로 묶어도 빨라지지 않고,
+    #  실패 시 어느 분할까지 저장됐는지 알 수 없게 됨)
+    for part_path, clip in zip(output_files, clips):
+        await page.screenshot(path=part_path, clip=clip, omit_background=False, **shot_options)
     
     return output_files
 
 
-def process_html_files(
+async def render_html_with_split(
+    html_content: str,
+    output_path: str,
+    *,
+    max_height: int = 2000,
+    scale: float = 2.0,
+    padding: int = 10,
+    page=None,
+    session: Optional[PlaywrightSession] = None,
+    image_format: Optional[str] = None,
+) -> List[str]:
+    """
+    HTML을 이미지로 렌더링하고, 필요시 행 단위로 분할합니다.
+    
+    Args:
+        html_content: HTML 내용
+        output_path: 출력 파일 경로 (분할 시 _1, _2 등이 추가됨)
+        max_height: 이미지 최대 높이 (픽셀)
+        scale: 이미지 스케일 (page나 session을 넘기면 그쪽 설정을 따름)
+        padding: 여백
+        page: 재사용할 페이지 (있으면 가장 우선)
+        session: 재사용할 PlaywrightSession (없으면 이번 호출만을 위해 새로 띄움)
+        image_format: 이미지 형식 ("png" 또는 "jpeg", None이면 경로 확장자로 판단)
+    
+    Returns:
+        생성된 이미지 파일 경로 리스트
+    """
+    if page is not None:
+        return await _render_on_page(
+            page,
+            html_content,
+            output_path,
+            max_height=max_height,
+            padding=padding,
+            image_format=image_format,
+        )
+    
+    if session is None:
+        async with PlaywrightSession(scale=scale) as own_session:
+            return await render_html_with_split(
+                html_content,
+                output_path,
+                max_height=max_height,
+                padding=padding,
+                session=own_session,
+                image_format=image_format,
+            )
+    
+    page = await session.get_page()
+    try:
+        return await _render_on_page(
+            page,
+            html_content,
+            output_path,
+            max_height=max_height,
+            padding=padding,
+            image_format=image_format,
+        )
+    finally:
+        await page.close()
+
+
+async def process_html_files_async(
     input_dir: str,
     output_dir: str,
     *,
     max_height: int = 2000,
     scale: float = 2.0,
     overwrite: bool = False,
+    concurrency: Optional[int] = None,
+    browsers: int = 1,
+    session: Optional[PlaywrightSession] = None,
+    image_format: str = "png",
 ):
     """
     디렉토리 내 모든 HTML 파일을 처리합니다.
+    브라우저는 browsers개만 띄우고, 최대 concurrency개의 파일을 각각 새 페이지에서
+    동시에 렌더링합니다 (기본값: CPU 코어 수).
+    Chromium은 브라우저 하나당 스크린샷을 한 번에 하나씩만 찍으므로,
+    파일을 여러 브라우저에 번갈아 배정해 캡처 대기열을 나눕니다.
+    session을 넘기면 scale, browsers 대신 해당 세션을 그대로 사용합니다.
     """
+    concurrency = max(1, concurrency or os.cpu_count() or 1)
+    browsers = max(1, min(browsers, concurrency))
+    ext = IMAGE_EXTENSIONS[image_format]
     inp = Path(input_dir)
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
@@ -353,65 +509,101 @@ def process_html_files(
     print("-" * 50)
     
     total_images = 0
-    
-    for i, html_file in enumerate(html_files):
-        print(f"[{i+1}/{len(html_files)}] Processing {html_file.name}...")
-        
-        try:
-            html_content = html_file.read_text(encoding="utf-8")
-            html_content = clean_markdown_codeblocks(html_content)
-            html_content = remove_caption_tags(html_content)
-            
-            output_path = out / f"{html_file.stem}.png"
-            
-            # 기존 파일 확인
-            if not overwrite and output_path.exists():
-                counter = 1
-                while output_path.exists():
-                    output_path = out / f"{html_file.stem}_{counter}.png"
-                    counter += 1
-            
-            # 렌더링 및 분할
-            output_files = asyncio.run(
-                render_html_with_split(
+    # 이번 실행에서 이미 배정한 출력 파일명 (동시에 처리되는 파일끼리 이름이 겹치지 않도록)
+    claimed = set()
+    
+    async def work(i: int, html_file: Path, session: PlaywrightSession, sem: asyncio.Semaphore) -> Tuple[int, List[str]]:
+        # 동시에 처리되는 파일들의 출력이 섞이지 않도록 파일 단위로 모아서 출력
+        logs: List[str] = [f"[{i+1}/{len(html_files)}] Processing {html_file.name}..."]
+        async with sem:
+            page = None
+            try:
+                # 파일 읽기와 정리는 스레드에서 처리해 다른 파일의 브라우저 작업과 겹치게 함
+                html_content = await asyncio.to_thread(_load_and_clean, html_file)
+                
+                output_path = out / f"{html_file.stem}.{ext}"
+                
+                # 기존 파일 확인
+                if not overwrite:
+                    counter = 1
+                    while output_path.name in claimed or output_path.exists():
+                        output_path = out / f"{html_file.stem}_{counter}.{ext}"
+                        counter += 1
+                claimed.add(output_path.name)
+                
+                # 렌더링 및 분할
+                page = await session.get_page()
+                output_files = await _render_on_page(
+                    page,
                     html_content,
                     str(output_path),
                     max_height=max_height,
-                    scale=scale,
+                    image_format=image_format,
                 )
-            )
-            
-            total_images += len(output_files)
-            
-            if len(output_files) == 1:
-                print(f"  -> Saved: {Path(output_files[0]).name}")
-            else:
-                print(f"  -> Split into {len(output_files)} images")
-            
-        except Exception as e:
-            print(f"  -> Failed: {e}")
+                
+                if len(output_files) == 1:
+                    logs.append(f"  -> Saved: {Path(output_files[0]).name}")
+                else:
+                    logs.append(f"  -> Split into {len(output_files)} images")
+                return len(output_files), logs
+                
+            except Exception as e:
+                logs.append(f"  -> Failed: {e}")
+                return 0, logs
+            finally:
+                if page is not None:
+                    await page.close()
+    
+    own_session = session is None
+    if own_session:
+        session = PlaywrightSession(scale=scale, browsers=browsers)
+    try:
+        sem = asyncio.Semaphore(concurrency)
+        tasks = [
+            asyncio.create_task(work(i, html_file, session, sem))
+            for i, html_file in enumerate(html_files)
+        ]
+        # 끝나는 순서대로 진행 상황 출력
+        for task in asyncio.as_completed(tasks):
+            count, logs = await task
+            total_images += count
+            print("\n".join(logs))
+    finally:
+        if own_session:
+            await session.close()
     
     print("-" * 50)
     print(f"Done. Generated {total_images} images from {len(html_files)} HTML files.")
 
 
+def process_html_files(
+    input_dir: str,
+    output_dir: str,
+    **kwargs,
+):
+    """process_html_files_async의 동기 래퍼 (이벤트 루프는 한 번만 생성)."""
+    asyncio.run(process_html_files_async(input_dir, output_dir, **kwargs))
+
+
 async def render_single_html(
     html_path: str,
     output_path: str,
     *,
     max_height: int = 2000,
     scale: float = 2.0,
+    session: Optional[PlaywrightSession] = None,
+    image_format: Optional[str] = None,
 ):
     """단일 HTML 파일을 처리합니다."""
-    html_content = Path(html_path).read_text(encoding="utf-8")
-    html_content = clean_markdown_codeblocks(html_content)
-    html_content = remove_caption_tags(html_content)
+    html_content = _load_and_clean(Path(html_path))
     
     output_files = await render_html_with_split(
         html_content,
         output_path,
         max_height=max_height,
         scale=scale,
+        session=session,
+        image_format=image_format,
     )
     
     return output_files
@@ -458,9 +650,41 @@ if __name__ == "__main__":
         action="store_true", 
         help="Overwrite existing files"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of HTML files rendered concurrently (default: CPU count)"
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=1,
+        help="Number of browser instances sharing the work (default: 1)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(IMAGE_EXTENSIONS),
+        default="png",
+        help="Output image format (jpeg is faster to encode and smaller)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log row ranges of each split part"
+    )
     
     args = parser.parse_args()
     
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S"
+    )
+    # 루트는 INFO로 두고 이 모듈만 DEBUG로 올림 (asyncio 등 외부 라이브러리 디버그 로그 제외)
+    if args.verbose:
+        log.setLevel(logging.DEBUG)
+    
     print(f"HTML to Image Converter (with auto-split)")
     print(f"Max height: {args.max_height}px")
     print(f"Scale: {args.scale}x")
@@ -468,13 +692,14 @@ if __name__ == "__main__":
     
     if args.input_file:
         # 단일 파일 처리
-        output_path = args.output_file or f"{Path(args.input_file).stem}.png"
+        output_path = args.output_file or f"{Path(args.input_file).stem}.{IMAGE_EXTENSIONS[args.format]}"
         output_files = asyncio.run(
             render_single_html(
                 args.input_file,
                 output_path,
                 max_height=args.max_height,
                 scale=args.scale,
+                image_format=args.format,
             )
         )
         print(f"Generated {len(output_files)} image(s):")
@@ -488,4 +713,7 @@ if __name__ == "__main__":
             max_height=args.max_height,
             scale=args.scale,
             overwrite=args.overwrite,
+            concurrency=args.concurrency,
+            browsers=args.browsers,
+            image_format=args.format,
         )
@@ -0,0 +1,54 @@
+"""
+여러 스크립트에서 공통으로 사용하는 HTML 문자열 처리 함수
+- Playwright 등 무거운 의존성 없이 표준 라이브러리만 사용
+"""
+
+import re
+from typing import Optional
+
+
+# CSS 선언(font-family: ...)과 속성 형태(font-family="...")를 하나의 패턴으로 한 번에 탐색.
+# CSS 값 길이를 제한해 종결자(; 또는 })가 없는 긴 CSS에서의 백트래킹을 억제
+_FONT_FAMILY_RE = re.compile(
+    r"font-family\s*(?::\s*([^;{}]{1,512})(?=[;}])|=\s*['\"]([^'\"]+)['\"])",
+    re.IGNORECASE,
+)
+
+
+def extract_font_family_from_html(html_content: str) -> Optional[str]:
+    """
+    HTML 내용에서 처음 나오는 font-family 값을 추출합니다 (없으면 None).
+    """
+    # font-family가 아예 없으면 정규식 탐색 생략하고, 있으면 첫 위치부터 탐색
+    start = html_content.find("font-family")
+    if start < 0:
+        # 대소문자가 다른 선언(Font-Family 등)은 드물므로 이때만 소문자 사본으로 확인
+        if "font-family" not in html_content.lower():
+            return None
+        start = 0
+
+    for match in _FONT_FAMILY_RE.finditer(html_content, start):
+        # 따옴표 정리 후 값이 비어 있으면 다음 선언을 확인
+        font_family = (match.group(1) or match.group(2)).strip().replace('"', "'").strip()
+        if font_family:
+            return font_family
+
+    return None
+
+
+def clean_markdown_codeblocks(content: str) -> str:
+    """
+    HTML 내용에서 마크다운 코드블록(```html ... ```)을 제거합니다.
+    """
+    content = content.strip()
+
+    # 마크다운 코드블록 제거 (줄 목록을 만들지 않고 첫 줄/마지막 줄만 잘라냄)
+    if content.startswith("```"):
+        # 첫 줄 (```html 등) 제거
+        _, _, content = content.partition("\n")
+        # 마지막 줄 (```) 제거
+        head, _, last = content.rpartition("\n")
+        if last.strip() == "```":
+            content = head
+
+    return content.strip()
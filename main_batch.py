@@ -5,32 +5,73 @@ from pathlib import Path
 import argparse
 import logging
 import json
+import os
+import random
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from google.genai import types
 from google import genai
 
-from make_prompt import generate_weighted_prompt
+from html_utils import clean_markdown_codeblocks
+from make_prompt import generate_weighted_prompts
 
+# orjson이 설치되어 있으면 JSON 직렬화/파싱에 사용 (UTF-8 bytes를 바로 다룸)
+try:
+    import orjson
 
-def clean_markdown_codeblocks(content: str) -> str:
-    """
-    HTML 내용에서 마크다운 코드블록(```html ... ```)을 제거합니다.
-    """
-    content = content.strip()
-    
-    # 마크다운 코드블록 제거
-    if content.startswith("```"):
-        lines = content.split("\n")
-        # 첫 줄 (```html 등) 제거
-        lines = lines[1:]
-        # 마지막 줄 (```) 제거
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+
+def iter_jsonl_lines(path: str):
+    """JSONL 파일을 한 줄씩(bytes) 읽어 반환합니다. 빈 줄은 건너뜁니다."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _save_result(
+    html_path: Path,
+    html_content: str,
+    prompt_path: Optional[Path],
+    prompt_text: Optional[str],
+    note: str = "",
+) -> None:
+    """HTML과 (있으면) 해당 프롬프트를 파일로 저장합니다 (작업 스레드에서 실행)."""
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
     
-    return content.strip()
+    if prompt_path is None:
+        log.info(f"    [Saved] {html_path.name} ({note})")
+        return
+    try:
+        with open(prompt_path, "w", encoding="utf-8") as f:
+            f.write(prompt_text)
+        log.info(f"    [Saved] {html_path.name} + {prompt_path.name}")
+    except Exception as e:
+        log.warning(f"    [Saved] {html_path.name} (failed to save prompt: {e})")
+
+
+# 저장된 결과 파일명에서 번호 추출 ('prompt_0012.html' -> '0012')
+_PROMPT_HTML_RE = re.compile(r"^prompt_(?:.*_)?(\d+)\.html$")
+
+# 결과 파일 저장에 사용할 스레드 수
+SAVE_WORKERS = 8
+
+# Batch 상태 조회 간격 (초): 처음에는 짧게, 이후 지수적으로 늘려 최대값에서 고정
+POLL_INITIAL_DELAY = 5.0
+POLL_MAX_DELAY = 60.0
+POLL_BACKOFF = 1.5
 
 
 # 로깅 설정
@@ -68,6 +109,8 @@ class GeminiBatchQAGenerator:
         self.temperature = temperature
         self.num_prompts = num_prompts
         self.max_attempts_count = max_attempts_count
+        # 생성 설정은 실행 중 바뀌지 않으므로 한 번만 만들어 둠
+        self._gen_config = self._make_gen_config_dict()
         
         self.api_key = self._load_api_key(api_key_file)
         self.client = genai.Client(api_key=self.api_key, http_options={'api_version': 'v1beta'})
@@ -91,10 +134,7 @@ class GeminiBatchQAGenerator:
 
     def generate_prompts(self) -> List[str]:
         """make_prompt.py를 사용하여 프롬프트 목록 생성"""
-        prompts = []
-        for _ in range(self.num_prompts):
-            prompt = generate_weighted_prompt()
-            prompts.append(prompt)
+        prompts = generate_weighted_prompts(self.num_prompts)
         log.info(f"[*] Generated {len(prompts)} prompts")
         return prompts
 
@@ -106,27 +146,29 @@ class GeminiBatchQAGenerator:
         """프롬프트 목록으로 Batch 요청 JSONL 파일 생성"""
         valid_count = 0
         
-        with open(output_filename, "w", encoding="utf-8") as f:
+        with open(output_filename, "wb") as f:
             for idx, prompt in enumerate(prompts):
+                # 요청 본문은 프롬프트마다 한 번만 만들고 시도 횟수만큼 재사용
+                request_body = {
+                    "contents": [
+                        {
+                            "role": "user",
+                            "parts": [{"text": prompt}]
+                        }
+                    ],
+                    "generation_config": self._gen_config,
+                }
+                
                 for attempt in range(self.max_attempts_count):
                     key = f"prompt_{idx:04d}|{attempt}"
                     
-                    request_body = {
-                        "contents": [
-                            {
-                                "role": "user",
-                                "parts": [{"text": prompt}]
-                            }
-                        ],
-                        "generation_config": self._make_gen_config_dict(),
-                    }
-                    
                     request_data = {
                         "key": key,
                         "request": request_body
                     }
                     
-                    f.write(json.dumps(request_data, ensure_ascii=False) + "\n")
+                    f.write(_dumps(request_data))
+                    f.write(b"\n")
                     valid_count += 1
         
         log.info(f"[*] Created batch file: {output_filename} (Requests: {valid_count})")
@@ -161,7 +203,8 @@ class GeminiBatchQAGenerator:
                     pass
             return None
 
-        # 3. 상태 대기 (Polling)
+        # 3. 상태 대기 (Polling, 지수 백오프 + 지터)
+        delay = POLL_INITIAL_DELAY
         while True:
             try:
                 job = self.client.batches.get(name=job.name)
@@ -173,9 +216,11 @@ class GeminiBatchQAGenerator:
                 elif state_name in ["JOB_STATE_FAILED", "JOB_STATE_CANCELLED"]:
                     log.error(f"[!] Job Failed: {job.error}")
                     break
-            except Exception:
-                pass
-            time.sleep(30)
+            except Exception as e:
+                log.warning(f"    Failed to get job status: {e}")
+            # 여러 작업이 동시에 조회하지 않도록 약간의 무작위 지연 추가
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(POLL_MAX_DELAY, delay * POLL_BACKOFF)
 
         # 4. 사용이 끝난 JSONL 파일 삭제
         if batch_input_file:
@@ -194,12 +239,12 @@ class GeminiBatchQAGenerator:
         """결과 다운로드 및 저장 (파일명 숫자 자동 증가 방식, 프롬프트도 함께 저장)"""
         log.info("[*] Downloading results...")
         content = self.client.files.download(file=output_file_uri)
-        output_data = content.decode("utf-8")
         
-        # 디버깅용 저장
+        # 디버깅용 저장 (디코딩 없이 bytes 그대로 기록)
         debug_file = "debug_batch_results.jsonl"
-        with open(debug_file, "w", encoding="utf-8") as f:
-            f.write(output_data)
+        with open(debug_file, "wb") as f:
+            f.write(content)
+        del content  # 이후에는 저장된 파일을 한 줄씩 읽으므로 응답 전체를 메모리에 두지 않음
         log.info(f"[*] Raw response saved to {debug_file}")
 
         self.output_folder.mkdir(parents=True, exist_ok=True)
@@ -209,84 +254,89 @@ class GeminiBatchQAGenerator:
         # [수정] 현재 폴더에서 가장 높은 번호 찾기 (이어쓰기 준비)
         # -------------------------------------------------------
         max_idx = -1
-        existing_files = list(self.output_folder.glob("prompt_*.html"))
-        
-        for f in existing_files:
-            try:
-                # 'prompt_0012.html' -> '0012' -> 12 추출
-                num_part = f.stem.split('_')[-1] # prompt_XXXX 형태 가정
-                if num_part.isdigit():
-                    idx = int(num_part)
-                    if idx > max_idx:
-                        max_idx = idx
-            except Exception:
-                pass
+        # 디렉토리를 한 번만 훑으며 이름만 검사 (파일별 stat 없음)
+        with os.scandir(self.output_folder) as entries:
+            for entry in entries:
+                m = _PROMPT_HTML_RE.match(entry.name)
+                if m:
+                    max_idx = max(max_idx, int(m.group(1)))
         
         # 다음 저장할 번호 시작점 (예: 파일이 없으면 0, 9번까지 있으면 10)
         current_save_idx = max_idx + 1
         # -------------------------------------------------------
 
-        for line in output_data.strip().split("\n"):
-            try:
-                res = json.loads(line)
-                custom_id = res.get("custom_id") or res.get("key")
+        # 파일 쓰기는 스레드 풀에서 처리하고, 메인 루프는 계속 결과를 파싱
+        # (with 블록을 벗어날 때 예외가 나더라도 대기 중인 저장 작업을 모두 마침)
+        futures = []
+        with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as executor:
+            for line in iter_jsonl_lines(debug_file):
+                try:
+                    res = _loads(line)
+                    custom_id = res.get("custom_id") or res.get("key")
                 
-                if not custom_id:
-                    continue
+                    if not custom_id:
+                        continue
 
-                # 응답 파싱
-                response_val = res.get("response", {})
+                    # 응답 파싱
+                    response_val = res.get("response", {})
                 
-                # 에러 체크
-                if "status_code" in response_val and response_val["status_code"] != 200:
-                    log.error(f"[!] API Error: {response_val}")
-                    continue
+                    # 에러 체크
+                    if "status_code" in response_val and response_val["status_code"] != 200:
+                        log.error(f"[!] API Error: {response_val}")
+                        continue
 
-                body = response_val.get("body", response_val)
-                candidates = body.get("candidates", [])
+                    body = response_val.get("body", response_val)
+                    candidates = body.get("candidates", [])
                 
-                if not candidates:
-                    continue
+                    if not candidates:
+                        continue
                 
-                for cand in candidates:
-                    parts = cand.get("content", {}).get("parts", [])
-                    for part in parts:
-                        if "text" in part:
-                            # ---------------------------------------------------
-                            # [수정] 빈 번호를 찾아서 저장 + 프롬프트도 함께 저장
-                            # ---------------------------------------------------
-                            txt_path = self.output_folder / f"prompt_{current_save_idx:04d}.html"
-                            
-                            # 혹시 중간에 파일이 끼어있을 경우를 대비해 확실한 빈 번호 찾기
-                            while txt_path.exists():
-                                current_save_idx += 1
+                    for cand in candidates:
+                        parts = cand.get("content", {}).get("parts", [])
+                        for part in parts:
+                            if "text" in part:
+                                # ---------------------------------------------------
+                                # [수정] 빈 번호를 찾아서 저장 + 프롬프트도 함께 저장
+                                # ---------------------------------------------------
                                 txt_path = self.output_folder / f"prompt_{current_save_idx:04d}.html"
                             
-                            # HTML 파일 저장 (마크다운 코드블록 제거)
-                            html_content = clean_markdown_codeblocks(part["text"])
-                            with open(txt_path, "w", encoding="utf-8") as f:
-                                f.write(html_content)
+                                # 혹시 중간에 파일이 끼어있을 경우를 대비해 확실한 빈 번호 찾기
+                                while txt_path.exists():
+                                    current_save_idx += 1
+                                    txt_path = self.output_folder / f"prompt_{current_save_idx:04d}.html"
                             
-                            # 해당 프롬프트도 txt 파일로 저장
-                            try:
-                                # custom_id에서 원본 프롬프트 인덱스 추출 (prompt_0001|0 -> 1)
-                                prompt_idx = int(custom_id.split('|')[0].split('_')[-1])
-                                if 0 <= prompt_idx < len(prompts):
-                                    prompt_txt_path = self.output_folder / f"prompt_{current_save_idx:04d}.txt"
-                                    with open(prompt_txt_path, "w", encoding="utf-8") as f:
-                                        f.write(prompts[prompt_idx])
-                                    log.info(f"    [Saved] {txt_path.name} + {prompt_txt_path.name}")
-                                else:
-                                    log.info(f"    [Saved] {txt_path.name} (prompt index out of range)")
-                            except Exception as e:
-                                log.warning(f"    [Saved] {txt_path.name} (failed to save prompt: {e})")
+                                # HTML 내용 (마크다운 코드블록 제거)
+                                html_content = clean_markdown_codeblocks(part["text"])
                             
-                            success_count += 1
-                            current_save_idx += 1 # 다음 저장을 위해 번호 증가
-                            # ---------------------------------------------------
+                                # 해당 프롬프트도 txt 파일로 저장
+                                prompt_txt_path = None
+                                prompt_text = None
+                                note = "prompt index out of range"
+                                try:
+                                    # custom_id에서 원본 프롬프트 인덱스 추출 (prompt_0001|0 -> 1)
+                                    prompt_idx = int(custom_id.split('|')[0].split('_')[-1])
+                                    if 0 <= prompt_idx < len(prompts):
+                                        prompt_txt_path = self.output_folder / f"prompt_{current_save_idx:04d}.txt"
+                                        prompt_text = prompts[prompt_idx]
+                                except Exception as e:
+                                    note = f"failed to save prompt: {e}"
+                            
+                                futures.append(executor.submit(
+                                    _save_result, txt_path, html_content, prompt_txt_path, prompt_text, note
+                                ))
+                                current_save_idx += 1 # 다음 저장을 위해 번호 증가
+                                # ---------------------------------------------------
 
-            except Exception as e:
-                log.error(f"Error parsing line: {e}")
+                except Exception as e:
+                    log.error(f"Error parsing line: {e}")
+        
+        # 모든 저장 작업이 끝난 뒤 성공 개수 집계
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                success_count += 1
+            else:
+                log.error(f"Error saving result: {error}")
                 
         return success_count
 
@@ -313,8 +363,7 @@ def main():
         prompts_file = Path(args.output_folder) / "generated_prompts.txt"
         prompts_file.parent.mkdir(parents=True, exist_ok=True)
         with open(prompts_file, "w", encoding="utf-8") as f:
-            for i, p in enumerate(prompts):
-                f.write(f"=== Prompt {i:04d} ===\n{p}\n\n")
+            f.write("".join(f"=== Prompt {i:04d} ===\n{p}\n\n" for i, p in enumerate(prompts)))
         log.info(f"[*] Prompts saved to {prompts_file}")
         
         # 3. Batch 파일 생성
@@ -1,25 +1,28 @@
 import random
+import sys
+from bisect import bisect
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from itertools import accumulate
+from typing import Dict, Iterator, List, Sequence, Tuple, TypedDict
 
 
 # -----------------------------
 # Constants (data only)
 # -----------------------------
-INTROS: List[str] = [
+INTROS: Tuple[str, ...] = (
     "HTML 코드를 사용하여 표를 하나 작성해.",
     "웹페이지에 들어갈 HTML Table 하나만 만들어줘.",
     "데이터 파싱 테스트를 위한 HTML 표를 생성해라.",
     "보고서에 첨부할 깔끔한 HTML 표 코드를 줘.",
-]
+)
 
-BASE_CONSTRAINTS: List[str] = [
+BASE_CONSTRAINTS: Tuple[str, ...] = (
     "개인정보(이름, 전화번호)는 실제와 유사한 한국인 가상 데이터를 사용하며 그 외 주소및 숫자등 역시 실제 데이터처럼 보여야 한다.",
     "반드시 하나의 표로 구성되어야 한다.",
     "Table Margin은 따로 설정하지 말아라.",
-]
+)
 
-DATA_CONSTRAINTS: List[str] = [
+DATA_CONSTRAINTS: Tuple[str, ...] = (
     "날짜 데이터는 'YYYY.MM.DD' 형식을 반드시 지켜라.",  #  10
     "모든 금액 데이터에는 천 단위 콤마(,)를 붙여라.",     # 5
     "일부 셀에는 'N/A' 또는 공란을 포함시켜라.",         # 15
@@ -30,35 +33,59 @@ DATA_CONSTRAINTS: List[str] = [
     "한글이 메인이되 한자와 영어가 일부 섞이도록 해라.",   # 5
     "비어있는 셀(공란)을 많이 만들어라.",   # 10
     "맨 왼쪽 위는 비어있는 셀로 만들어라.",   # 15
-]
+)
 
-DATA_CONSTRAINTS_WEIGHTS: List[int] = [10, 5, 15, 5, 15, 15, 5, 5, 10, 15]
+DATA_CONSTRAINTS_WEIGHTS: Tuple[int, ...] = (10, 5, 15, 5, 15, 15, 5, 5, 10, 15)
 
-MERGE_STYLES: List[str] = [
+MERGE_STYLES: Tuple[str, ...] = (
     "헤더(Header) 부분에 복잡한 셀 병합을 적용해라.",
     "좌측 첫 번째 열(분류 열)을 세로로 병합해라.",
     "불규칙하게 셀을 병합하여 구조를 복잡하게 만들어라.",
-]
+)
 
-BORDER_STYLES: List[str] = ["실선(solid)", "이중선(double)", "점선(dotted)", "테두리 없음(border:0)"]
-BORDER_WEIGHTS: List[int] = [70, 5, 5, 20]
+BORDER_STYLES: Tuple[str, ...] = ("실선(solid)", "이중선(double)", "점선(dotted)", "테두리 없음(border:0)")
+BORDER_WEIGHTS: Tuple[int, ...] = (70, 5, 5, 20)
 
-FONTS: List[str] = ["궁서체 계열", "고딕체 계열", "타자기체"]
-HEADER_BG_CHOICES: List[str] = ["파스텔톤", "원색에 가까운 진한 색", "회색조 배경"]
+FONTS: Tuple[str, ...] = ("궁서체 계열", "고딕체 계열", "타자기체")
+HEADER_BG_CHOICES: Tuple[str, ...] = ("파스텔톤", "원색에 가까운 진한 색", "회색조 배경")
 
-DOMAIN_SETTINGS: Dict[str, Dict[str, object]] = {
-    "공공기관": {"weight": 40, "forms": ["주민등록등본", "지출결의서", "회의록", "근로계약서", "사업자등록증"]},
-    "의료/병원": {"weight": 35, "forms": ["환자 진료 기록", "혈액 검사 결과지", "입퇴원 확인서", "처방전"]},
-    "금융/회계": {"weight": 10, "forms": ["주민등록등본", "월간 손익계산서", "카드 사용 내역", "환율 변동표", "대출 상환표"]},
-    "물류/재고": {"weight": 10, "forms": ["창고 재고 목록", "일일 배송 리스트", "식자재 발주서", "차량 운행 일지"]},
-    "IT/개발": {"weight": 5, "forms": ["서버 에러 로그", "API 응답 명세서", "DB 스키마", "IP 접속 기록"]},
+
+class DomainSetting(TypedDict):
+    """도메인별 선택 가중치와 양식 목록"""
+    weight: int
+    forms: Tuple[str, ...]
+
+
+DOMAIN_SETTINGS: Dict[str, DomainSetting] = {
+    "공공기관": {"weight": 40, "forms": ("주민등록등본", "지출결의서", "회의록", "근로계약서", "사업자등록증")},
+    "의료/병원": {"weight": 35, "forms": ("환자 진료 기록", "혈액 검사 결과지", "입퇴원 확인서", "처방전")},
+    "금융/회계": {"weight": 10, "forms": ("주민등록등본", "월간 손익계산서", "카드 사용 내역", "환율 변동표", "대출 상환표")},
+    "물류/재고": {"weight": 10, "forms": ("창고 재고 목록", "일일 배송 리스트", "식자재 발주서", "차량 운행 일지")},
+    "IT/개발": {"weight": 5, "forms": ("서버 에러 로그", "API 응답 명세서", "DB 스키마", "IP 접속 기록")},
 }
 
+# 고정 가중치의 누적 합 (random.choices가 호출마다 하던 accumulate를 미리 계산)
+_DOMAIN_KEYS: Tuple[str, ...] = tuple(DOMAIN_SETTINGS)
+_DOMAIN_CUM: Tuple[int, ...] = tuple(accumulate(DOMAIN_SETTINGS[d]["weight"] for d in _DOMAIN_KEYS))
+_BORDER_CUM: Tuple[int, ...] = tuple(accumulate(BORDER_WEIGHTS))
+
+# random 모듈 함수의 바운드 메서드를 미리 가져와 호출마다의 속성 조회를 생략.
+# 별도 Random 인스턴스를 만들지 않으므로 random.seed()로 재현성 제어는 그대로 유지됨
+_rand = random.random
+_randrange = random.randrange
+_randint = random.randint
+_choice = random.choice
+_sample = random.sample
+
 
 # -----------------------------
 # Configuration dataclasses
 # -----------------------------
-@dataclass
+# 프롬프트마다 생성되고 버려지므로 __dict__ 없이 __slots__로 생성 (slots 인자는 Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class StructureConfig:
     """표 구조 관련 설정"""
     rows: int
@@ -67,7 +94,7 @@ class StructureConfig:
     use_column_mismatch: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class StyleConfig:
     """스타일 관련 설정"""
     use_stripe: bool = False
@@ -85,42 +112,64 @@ def weighted_choice(options: List[str], weights: List[int]) -> str:
     return random.choices(options, weights=weights, k=1)[0]
 
 
-def select_domain_and_form(domain_settings: Dict[str, Dict[str, object]]) -> Tuple[str, str]:
+def _weighted_pick(options: Sequence[str], cum_weights: Sequence[int]) -> str:
+    """Return one option using precomputed cumulative weights (same draw as random.choices)."""
+    return options[bisect(cum_weights, _rand() * cum_weights[-1], 0, len(options) - 1)]
+
+
+def select_domain_and_form(domain_settings: Dict[str, DomainSetting]) -> Tuple[str, str]:
     """Pick a domain by weight, then pick one form inside that domain."""
-    domains = list(domain_settings.keys())
-    weights = [int(domain_settings[d]["weight"]) for d in domains]
-    domain = weighted_choice(domains, weights)
-    form = random.choice(list(domain_settings[domain]["forms"]))  # type: ignore[arg-type]
+    if domain_settings is DOMAIN_SETTINGS:
+        domains, cum_weights = _DOMAIN_KEYS, _DOMAIN_CUM
+    else:
+        domains = tuple(domain_settings)
+        cum_weights = tuple(accumulate(domain_settings[d]["weight"] for d in domains))
+    domain = _weighted_pick(domains, cum_weights)
+    form = _choice(domain_settings[domain]["forms"])
     return domain, form
 
 
 # -----------------------------
 # Config generators (랜덤 결정 로직)
 # -----------------------------
-def generate_data_constraints(count: int) -> List[str]:
+def _sample_two(seq: Sequence[str]) -> Tuple[str, str]:
+    """서로 다른 원소 2개를 무작위 순서로 뽑음 (random.sample(seq, 2)와 같은 분포)"""
+    n = len(seq)
+    i = _randrange(n)
+    j = _randrange(n - 1)
+    if j >= i:
+        j += 1
+    return seq[i], seq[j]
+
+
+def generate_data_constraints(count: int) -> Tuple[str, ...]:
     """지정된 개수만큼 데이터 제약조건을 샘플링하여 반환"""
+    # 실제 호출은 0~2개뿐이므로 random.sample의 준비 비용 없이 직접 뽑음
     if count <= 0:
-        return []
-    return random.sample(DATA_CONSTRAINTS, k=min(count, len(DATA_CONSTRAINTS)))
+        return ()
+    if count == 1:
+        return (DATA_CONSTRAINTS[_randrange(len(DATA_CONSTRAINTS))],)
+    if count == 2:
+        return _sample_two(DATA_CONSTRAINTS)
+    return tuple(_sample(DATA_CONSTRAINTS, k=min(count, len(DATA_CONSTRAINTS))))
 
 
 def generate_structure_config() -> StructureConfig:
     """표 구조 설정을 생성하여 반환"""
-    rows = random.randint(3, 16)
-    cols = random.randint(2, 10)
+    rows = _randint(3, 16)
+    cols = _randint(2, 10)
     
     merge_styles: List[str] = []
     use_column_mismatch = False
     
     # 80% 확률로 병합 스타일 추가
-    if random.random() < 0.8:
-        pool = MERGE_STYLES[:]
-        random.shuffle(pool)
-        merge_styles.append(pool.pop())  # 최소 1개
-        while pool and random.random() < 0.5:
-            merge_styles.append(pool.pop())
+    if _rand() < 0.8:
+        # 개수: 1개 50%, 2개 25%, 3개 25% (셔플 후 50% 확률로 하나씩 더 꺼내던 방식과 같은 분포)
+        r = _rand()
+        k = 1 if r >= 0.5 else 2 if r >= 0.25 else 3
+        merge_styles = _sample(MERGE_STYLES, min(k, len(MERGE_STYLES)))
         
-        use_column_mismatch = random.random() < 0.3
+        use_column_mismatch = _rand() < 0.3
     
     return StructureConfig(
         rows=rows,
@@ -132,29 +181,30 @@ def generate_structure_config() -> StructureConfig:
 
 def generate_style_config() -> StyleConfig:
     """스타일 설정을 생성하여 반환"""
-    config = StyleConfig(font=random.choice(FONTS))
+    config = StyleConfig(font=_choice(FONTS))
     
     # 50% 확률로 스트라이프 + 테두리 스타일
-    if random.random() < 0.5:
+    if _rand() < 0.5:
         config.use_stripe = True
         
-        action = weighted_choice(["single", "double", "various"], [50, 25, 25])
-        if action == "single":
-            config.border_styles = [weighted_choice(BORDER_STYLES, BORDER_WEIGHTS)]
-        elif action == "double":
+        # 테두리 구성: single 50%, double 25%, various 25% (난수 하나로 바로 비교)
+        action = _rand()
+        if action < 0.5:
+            config.border_styles = [_weighted_pick(BORDER_STYLES, _BORDER_CUM)]
+        elif action < 0.75:
             config.border_styles = [
-                weighted_choice(BORDER_STYLES, BORDER_WEIGHTS),
-                weighted_choice(BORDER_STYLES, BORDER_WEIGHTS),
+                _weighted_pick(BORDER_STYLES, _BORDER_CUM),
+                _weighted_pick(BORDER_STYLES, _BORDER_CUM),
             ]
         # "various"인 경우 border_styles는 빈 리스트 유지
     
     # 색상 모드 결정
-    seed = random.random()
+    seed = _rand()
     if seed < 0.3:
         config.color_mode = "grayscale"
     elif seed < 0.35:
         config.color_mode = "header_bg"
-        config.header_bg = random.choice(HEADER_BG_CHOICES)
+        config.header_bg = _choice(HEADER_BG_CHOICES)
     
     return config
 
@@ -164,9 +214,8 @@ def generate_style_config() -> StyleConfig:
 # -----------------------------
 def build_structure_prompt(config: StructureConfig) -> List[str]:
     """구조 설정을 프롬프트 문자열 리스트로 변환"""
-    parts: List[str] = []
     # parts.append(f"표의 종횡비는 대략 {config.rows}:{config.cols}수준으로 만들어라.")
-    parts.extend(config.merge_styles)
+    parts: List[str] = list(config.merge_styles)
     
     if config.use_column_mismatch:
         parts.append(
@@ -203,35 +252,45 @@ def build_style_prompt(config: StyleConfig) -> str:
 # Main
 # -----------------------------
 def generate_weighted_prompt() -> str:
-    parts: List[str] = []
-
-    # 1) Intro + base constraints
-    parts.append(random.choice(INTROS))
-    parts.extend(BASE_CONSTRAINTS)
+    # 1) Intro + base constraints (리스트 리터럴로 한 번에 구성)
+    parts: List[str] = [_choice(INTROS), *BASE_CONSTRAINTS]
 
     # 2) Domain (weighted) + specific form
-    if random.random() < 0.7:
+    if _rand() < 0.7:
         domain, form = select_domain_and_form(DOMAIN_SETTINGS)
         parts.append(f"주제는 '{domain}' 분야의 '{form}' 양식이어야 한다.")
 
     # 3) Data constraints (0~2개 랜덤 결정)
-    data_constraint_count = random.randint(0, 2)
-    parts.extend(generate_data_constraints(data_constraint_count))
+    parts += generate_data_constraints(_randint(0, 2))
 
     # 4) Structure complexity (설정 생성 후 프롬프트로 변환)
-    structure_config = generate_structure_config()
-    parts.extend(build_structure_prompt(structure_config))
+    parts += build_structure_prompt(generate_structure_config())
 
-    # 5) Style (설정 생성 후 프롬프트로 변환)
+    # 5) Style (설정 생성 후 프롬프트로 변환) + 마무리 문장
     style_config = generate_style_config()
-    parts.append(f"스타일 요구사항: {build_style_prompt(style_config)}")
-    
-    parts.append("답변은 오직 HTML 코드만 출력하고 설명은 생략해라.")
+    parts += (
+        f"스타일 요구사항: {build_style_prompt(style_config)}",
+        "답변은 오직 HTML 코드만 출력하고 설명은 생략해라.",
+    )
 
     return "\n".join(parts)
 
 
+def iter_weighted_prompts(n: int) -> Iterator[str]:
+    """프롬프트 n개를 하나씩 생성 (전체 목록을 메모리에 들고 있지 않아도 되는 경우용)"""
+    generate = generate_weighted_prompt
+    for _ in range(n):
+        yield generate()
+
+
+def generate_weighted_prompts(n: int) -> List[str]:
+    """프롬프트 n개를 한 번에 생성 (generate_weighted_prompt를 n번 호출한 것과 같은 결과)"""
+    generate = generate_weighted_prompt
+    return [generate() for _ in range(n)]
+
+
 if __name__ == "__main__":
-    for _ in range(10):
-        print("\n--- 생성된 프롬프트 예시 ---")
-        print(generate_weighted_prompt())
+    # print를 여러 번 호출하지 않고 한 번에 출력
+    sys.stdout.write("".join(
+        f"\n--- 생성된 프롬프트 예시 ---\n{prompt}\n" for prompt in iter_weighted_prompts(10)
+    ))
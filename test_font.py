@@ -1,6 +1,5 @@
 """폰트 추출 및 적용 테스트"""
-import re
-from typing import Optional
+from html_utils import extract_font_family_from_html
 
 DEFAULT_KOREAN_FONTS = (
     "'Malgun Gothic', '맑은 고딕', "
@@ -12,23 +11,6 @@ DEFAULT_KOREAN_FONTS = (
     "sans-serif"
 )
 
-def extract_font_family_from_html(html_content: str) -> Optional[str]:
-    """HTML에서 font-family 추출"""
-    patterns = [
-        r"font-family\s*:\s*([^;}{]+)[;}]",
-        r"font-family\s*=\s*['\"]([^'\"]+)['\"]",
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
-        if matches:
-            font_family = matches[0].strip().replace('"', "'").strip()
-            if font_family:
-                return font_family
-    
-    return None
-
-
 # 테스트
 html = """
 <!DOCTYPE html>